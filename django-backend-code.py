@@ -2,10 +2,33 @@
 # Save these files in your Django project
 
 # models.py
+import datetime
+from django.contrib.auth.models import User
 from django.contrib.gis.db import models
 from django.contrib.gis.geos import Point, Polygon
+from django.contrib.postgres.indexes import BrinIndex
+from django.db import connection, transaction
+from django.db.models import F
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
 from django.utils import timezone
 
+def geodesic_area_km2(polygon):
+    """Area on the WGS84 spheroid, measured by PostGIS via the geography type"""
+    with connection.cursor() as cursor:
+        cursor.execute('SELECT ST_Area(ST_GeomFromEWKB(%s)::geography)', [bytes(polygon.ewkb)])
+        return cursor.fetchone()[0] / 1000000  # Convert to km²
+
+# Tolerances in degrees (~100 m and ~10 m at the equator) of the simplified
+# polygons that lists and the map draw instead of the full drawing
+POLYGON_SIMPLIFY_TOLERANCES = {'low': 0.001, 'medium': 0.0001}
+# Column served for each geometry_detail level
+MISSION_POLYGON_FIELDS = {'low': 'polygon_low', 'medium': 'polygon_medium', 'full': 'polygon'}
+
+def simplified_polygon(polygon, detail):
+    """GEOS equivalent of ST_SimplifyPreserveTopology: fewer vertices, still a valid polygon"""
+    return polygon.simplify(POLYGON_SIMPLIFY_TOLERANCES[detail], preserve_topology=True)
+
 class Mission(models.Model):
     title = models.CharField(max_length=200)
     description = models.TextField(blank=True, null=True)
@@ -15,65 +38,357 @@ class Mission(models.Model):
     center_lat = models.FloatField()
     center_lon = models.FloatField()
     polygon = models.PolygonField(null=True, blank=True)
+    # Derived from polygon on save (see backfill_mission_geometry for old rows)
+    polygon_low = models.PolygonField(null=True, blank=True, spatial_index=False)
+    polygon_medium = models.PolygonField(null=True, blank=True, spatial_index=False)
+    area_km2 = models.FloatField(default=0)
+    bbox_west = models.FloatField(null=True, blank=True)
+    bbox_south = models.FloatField(null=True, blank=True)
+    bbox_east = models.FloatField(null=True, blank=True)
+    bbox_north = models.FloatField(null=True, blank=True)
+    # Bumped when the polygon changes; refresh_mission_membership recomputes
+    # Sighting.inside_mission_area and records the version it caught up to
+    polygon_version = models.IntegerField(default=0)
+    membership_version = models.IntegerField(default=0)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
     def __str__(self):
         return self.title
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        if 'polygon' in field_names:
+            instance._loaded_polygon = instance.polygon.clone() if instance.polygon else None
+        return instance
+
+    def polygon_changed(self):
+        if self._state.adding or not hasattr(self, '_loaded_polygon'):
+            return True
+        if self.polygon is None or self._loaded_polygon is None:
+            return self.polygon is not self._loaded_polygon
+        return not self.polygon.equals_exact(self._loaded_polygon)
+
+    def save(self, *args, **kwargs):
+        if self.polygon_changed():
+            if self.polygon:
+                self.area_km2 = geodesic_area_km2(self.polygon)
+                self.bbox_west, self.bbox_south, self.bbox_east, self.bbox_north = self.polygon.extent
+                self.polygon_low = simplified_polygon(self.polygon, 'low')
+                self.polygon_medium = simplified_polygon(self.polygon, 'medium')
+            else:
+                self.polygon_low = self.polygon_medium = None
+                self.area_km2 = 0
+                self.bbox_west = self.bbox_south = self.bbox_east = self.bbox_north = None
+            if not self._state.adding:
+                self.polygon_version += 1
+        super().save(*args, **kwargs)
+        self._loaded_polygon = self.polygon.clone() if self.polygon else None
+
     @property
     def center(self):
         return {"lat": self.center_lat, "lng": self.center_lon}
 
     @property
     def area_coverage_km2(self):
-        if self.polygon:
-            # Convert to appropriate coordinate system for area calculation
-            area_m2 = self.polygon.transform(3857, clone=True).area
-            return area_m2 / 1000000  # Convert to km²
-        return 0
+        return self.area_km2
+
+    @property
+    def bbox(self):
+        if self.bbox_west is None:
+            return None
+        return [self.bbox_west, self.bbox_south, self.bbox_east, self.bbox_north]
+
+    def contains_point(self, point):
+        """Missions without a polygon accept every point"""
+        if self.polygon is None:
+            return True
+        # Missions from MissionCache carry the polygon prepared once for all their lookups
+        prepared = getattr(self, '_prepared_polygon', None)
+        return (prepared or self.polygon).contains(point)
+
+    def sighting_counts(self):
+        """Return (total, sterilized) inside the mission area, from the rollup if present"""
+        rollup = MissionRollup.objects.filter(mission_id=self.id).values_list(
+            'total_sightings', 'sterilized_count'
+        ).first()
+        if rollup is not None:
+            return rollup
+        sightings = self.sightings.filter(inside_mission_area=True)
+        return sightings.count(), sightings.filter(sterilized=True).count()
 
 class Sighting(models.Model):
     mission = models.ForeignKey(Mission, on_delete=models.CASCADE, related_name='sightings')
     name = models.CharField(max_length=100)
+    species = models.CharField(max_length=50, blank=True, default='')
     sterilized = models.BooleanField(default=False)
-    location = models.PointField()
+    location = models.PointField()  # GiST-indexed by default (spatial_index=True)
+    user = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True, related_name='sightings')
+    # Client-generated key that makes retried bulk uploads safe; unique per user
+    idempotency_key = models.CharField(max_length=64, null=True, blank=True)
+    # Whether location lies within the mission polygon: set on save, and by
+    # refresh_mission_membership after the polygon is edited
+    inside_mission_area = models.BooleanField(default=True)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    class Meta:
+        unique_together = ['user', 'idempotency_key']
+        indexes = [
+            # Serves the dashboard delta query (mission_id = ? AND updated_at > ?)
+            models.Index(fields=['mission', 'updated_at']),
+            # Keyset pagination of the sighting list walks this index
+            models.Index(fields=['created_at', 'id']),
+            # Mission sightings, dashboard and statistics all filter on this
+            models.Index(fields=['mission', 'inside_mission_area']),
+            # Rows arrive in created_at order, so a few KB of block ranges
+            # serve the wide time-range scans of the trends endpoints
+            BrinIndex(fields=['created_at'], name='sighting_created_at_brin'),
+        ]
+
     def __str__(self):
         return f"{self.name} - {self.mission.title}"
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Remember the counted fields so saves can move the mission rollup
+        if {'mission_id', 'sterilized', 'inside_mission_area'}.issubset(field_names):
+            instance._counted = (instance.mission_id, instance.sterilized, instance.inside_mission_area)
+        # ...and where it was, so a move invalidates the map tiles it left
+        if 'location' in field_names:
+            instance._loaded_location = instance.location
+        return instance
+
+    def save(self, *args, **kwargs):
+        counted = getattr(self, '_counted', None)
+        loaded_location = getattr(self, '_loaded_location', None)
+        if (self._state.adding or counted is None or loaded_location is None
+                or counted[0] != self.mission_id or not loaded_location.equals_exact(self.location)):
+            self.inside_mission_area = self.mission.contains_point(self.location)
+
+        # The row and its rollup update (post_save) commit together
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+
     @property
     def coordinates(self):
         return [self.location.x, self.location.y]  # [lng, lat]
 
+class SightingTombstone(models.Model):
+    """Records a deleted sighting so delta dashboard polls can drop it"""
+    # Plain integers rather than foreign keys: the rows they point at are gone,
+    # and a cascading Mission delete must not be blocked by its own tombstones.
+    mission_id = models.IntegerField()
+    sighting_id = models.IntegerField()
+    deleted_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['mission_id', 'deleted_at']),
+        ]
+
+    def __str__(self):
+        return f"Sighting {self.sighting_id} deleted at {self.deleted_at}"
+
+class MissionRollup(models.Model):
+    """Per-mission counters of sightings inside the mission area, kept current by the Sighting signals below"""
+    mission = models.OneToOneField(Mission, on_delete=models.CASCADE, primary_key=True, related_name='rollup')
+    total_sightings = models.IntegerField(default=0)
+    sterilized_count = models.IntegerField(default=0)
+
+    def __str__(self):
+        return f"{self.mission_id}: {self.sterilized_count}/{self.total_sightings}"
+
+def bump_mission_rollup(mission_id, total=0, sterilized=0, create=True):
+    if not total and not sterilized:
+        return
+    updated = MissionRollup.objects.filter(mission_id=mission_id).update(
+        total_sightings=F('total_sightings') + total,
+        sterilized_count=F('sterilized_count') + sterilized,
+    )
+    if not updated and create:
+        MissionRollup.objects.get_or_create(mission_id=mission_id)
+        bump_mission_rollup(mission_id, total, sterilized, create=False)
+
+@receiver(post_save, sender=Mission)
+def create_mission_rollup(sender, instance, created, **kwargs):
+    if created:
+        MissionRollup.objects.get_or_create(mission=instance)
+
+def rollup_contribution(mission_id, sterilized, inside):
+    """What one sighting adds to its mission rollup: {mission_id: (total, sterilized)}"""
+    return {mission_id: (1, int(sterilized))} if inside else {}
+
+@receiver(post_save, sender=Sighting)
+def count_saved_sighting(sender, instance, created, **kwargs):
+    old = None if created else getattr(instance, '_counted', None)
+    if old is None and not created:
+        # Saved without having been loaded; rebuild_rollups repairs any drift
+        old = (instance.mission_id, instance.sterilized, instance.inside_mission_area)
+    before = rollup_contribution(*old) if old else {}
+    after = rollup_contribution(instance.mission_id, instance.sterilized, instance.inside_mission_area)
+
+    for mission_id in before.keys() | after.keys():
+        old_total, old_sterilized = before.get(mission_id, (0, 0))
+        new_total, new_sterilized = after.get(mission_id, (0, 0))
+        bump_mission_rollup(mission_id, total=new_total - old_total, sterilized=new_sterilized - old_sterilized)
+    if old and old[0] != instance.mission_id:
+        # Moved to another mission: delta polls of the old one drop it like a deletion
+        SightingTombstone.objects.create(mission_id=old[0], sighting_id=instance.id)
+    instance._counted = (instance.mission_id, instance.sterilized, instance.inside_mission_area)
+
+@receiver(post_delete, sender=Sighting)
+def record_sighting_tombstone(sender, instance, **kwargs):
+    SightingTombstone.objects.create(mission_id=instance.mission_id, sighting_id=instance.id)
+    # No create: during a cascading Mission delete the rollup is going away too
+    if instance.inside_mission_area:
+        bump_mission_rollup(instance.mission_id, total=-1, sterilized=-int(instance.sterilized), create=False)
+
+class HotspotCell(models.Model):
+    """Sightings per geohash cell per day for the coarse heatmap zooms; lat/lng is the cell centre"""
+    day = models.DateField()
+    precision = models.SmallIntegerField()
+    cell = models.CharField(max_length=12)
+    lat = models.FloatField()
+    lng = models.FloatField()
+    count = models.IntegerField()
+    sterilized_count = models.IntegerField()
+
+    class Meta:
+        unique_together = ['precision', 'day', 'cell']
+
+    def __str__(self):
+        return f"{self.cell} on {self.day}: {self.count}"
+
+class HotspotDay(models.Model):
+    """A UTC day rebuild_hotspots has filled in HotspotCell; other days are aggregated from raw rows"""
+    day = models.DateField(primary_key=True)
+    rebuilt_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"Hotspots for {self.day}"
+
+@receiver(post_save, sender=Sighting)
+@receiver(post_delete, sender=Sighting)
+def forget_hotspot_day(sender, instance, **kwargs):
+    # The day's cells no longer match its rows; it is read raw until
+    # rebuild_hotspots rebuilds it (created_at never changes, so a move stays
+    # on the same day)
+    HotspotDay.objects.filter(day=instance.created_at.astimezone(datetime.timezone.utc).date()).delete()
+
 # serializers.py
 from rest_framework import serializers
+from rest_framework_gis.fields import GeometryField
 from rest_framework_gis.serializers import GeoFeatureModelSerializer
-from .models import Mission, Sighting
+from django.http import Http404
+from .models import MISSION_POLYGON_FIELDS, Mission, Sighting
+from .mission_cache import mission_cache
+
+def geometry_detail(params, default):
+    """The geometry_detail query param: low, medium or full polygons"""
+    detail = params.get('geometry_detail') or default
+    if detail not in MISSION_POLYGON_FIELDS:
+        raise serializers.ValidationError({'error': 'Invalid geometry_detail, expected low, medium or full'})
+    return detail
 
 class MissionSerializer(serializers.ModelSerializer):
+    """Serves the polygon at context['geometry_detail'] (full by default); writes always take the full polygon"""
     center = serializers.ReadOnlyField()
     area_coverage_km2 = serializers.ReadOnlyField()
+    bbox = serializers.ReadOnlyField()  # [west, south, east, north]
     
     class Meta:
         model = Mission
         fields = [
             'id', 'title', 'description', 'date', 'city', 'area',
             'center_lat', 'center_lon', 'center', 'polygon',
-            'area_coverage_km2', 'created_at', 'updated_at'
+            'area_coverage_km2', 'bbox', 'created_at', 'updated_at'
         ]
 
+    def to_representation(self, instance):
+        data = super().to_representation(instance)
+        detail = self.context.get('geometry_detail', 'full')
+        if detail != 'full':
+            polygon = getattr(instance, MISSION_POLYGON_FIELDS[detail])
+            data['polygon'] = self.fields['polygon'].to_representation(polygon) if polygon else None
+        return data
+
+# Columns read by mission_rows, in output order
+MISSION_ROW_COLUMNS = (
+    'id', 'title', 'description', 'date', 'city', 'area', 'center_lat', 'center_lon', 'polygon',
+    'area_km2', 'bbox_west', 'bbox_south', 'bbox_east', 'bbox_north', 'created_at', 'updated_at',
+)
+
+def mission_values(queryset, detail='full'):
+    """Tuples for mission_rows, reading only the polygon column for detail; paginate these rather than the queryset"""
+    polygon = MISSION_POLYGON_FIELDS[detail]
+    return queryset.values_list(*(polygon if column == 'polygon' else column for column in MISSION_ROW_COLUMNS))
+
+def mission_rows(values):
+    """MissionSerializer(many=True) output built straight from mission_values() tuples"""
+    to_geojson = GeometryField().to_representation
+    to_date = serializers.DateField().to_representation
+    to_datetime = serializers.DateTimeField().to_representation
+    return [
+        {
+            'id': id, 'title': title, 'description': description,
+            'date': to_date(date) if date else None,
+            'city': city, 'area': area, 'center_lat': center_lat, 'center_lon': center_lon,
+            'center': {"lat": center_lat, "lng": center_lon},
+            'polygon': to_geojson(polygon) if polygon else None,
+            'area_coverage_km2': area_km2,
+            'bbox': None if bbox_west is None else [bbox_west, bbox_south, bbox_east, bbox_north],
+            'created_at': to_datetime(created_at),
+            'updated_at': to_datetime(updated_at),
+        }
+        for (
+            id, title, description, date, city, area, center_lat, center_lon, polygon,
+            area_km2, bbox_west, bbox_south, bbox_east, bbox_north, created_at, updated_at,
+        ) in values
+    ]
+
+class CachedMissionField(serializers.PrimaryKeyRelatedField):
+    """Mission by id, from the per-process MissionCache rather than a row fetch"""
+
+    def to_internal_value(self, data):
+        # Ids only: int() would turn 1.5 into mission 1
+        if isinstance(data, bool) or not isinstance(data, (int, str)):
+            self.fail('incorrect_type', data_type=type(data).__name__)
+        try:
+            return mission_cache.get(data)
+        except Http404:
+            self.fail('does_not_exist', pk_value=data)
+
 class SightingSerializer(serializers.ModelSerializer):
+    # Sighting.save tests the location against the cached, prepared polygon
+    mission = CachedMissionField(queryset=Mission.objects.all())
     coordinates = serializers.ReadOnlyField()
     
     class Meta:
         model = Sighting
         fields = [
-            'id', 'mission', 'name', 'sterilized', 'location',
-            'coordinates', 'created_at', 'updated_at'
+            'id', 'mission', 'name', 'species', 'sterilized', 'location',
+            'coordinates', 'inside_mission_area', 'created_at', 'updated_at'
         ]
+        read_only_fields = ['inside_mission_area']
+
+class BulkSightingSerializer(serializers.Serializer):
+    """One item of a bulk upload; mission is a plain id so validation runs no queries"""
+    idempotency_key = serializers.CharField(max_length=64, required=False)
+    mission = serializers.IntegerField()
+    name = serializers.CharField(max_length=100)
+    species = serializers.CharField(max_length=50, required=False, allow_blank=True, default='')
+    sterilized = serializers.BooleanField(default=False)
+    location = GeometryField()
+
+    def validate_location(self, value):
+        if value.geom_type != 'Point':
+            raise serializers.ValidationError('Expected a Point')
+        if value.srid is None:
+            value.srid = 4326
+        return value
 
 class MissionStatisticsSerializer(serializers.Serializer):
     total_sightings = serializers.IntegerField()
@@ -81,26 +396,1290 @@ class MissionStatisticsSerializer(serializers.Serializer):
     completion_percentage = serializers.FloatField()
     area_covered_km2 = serializers.FloatField()
 
+# filters.py
+import datetime
+from django.contrib.gis.geos import Polygon
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from rest_framework.exceptions import ValidationError
+
+class SightingFilter:
+    """Query-param filters shared by the sighting list and the map layers"""
+
+    STATUSES = {'active': False, 'sterilized': True}
+
+    def __init__(self, sterilized=None, species=None, mission_id=None, search=None,
+                 created_from=None, created_to=None, bbox=None, inside_mission_area=None):
+        self.sterilized = sterilized
+        self.species = species
+        self.mission_id = mission_id
+        self.search = search
+        self.created_from = created_from
+        self.created_to = created_to
+        self.bbox = bbox  # (west, south, east, north)
+        self.inside_mission_area = inside_mission_area
+
+    @classmethod
+    def from_params(cls, params):
+        statuses = {value for value in params.get('status', '').split(',') if value in cls.STATUSES}
+        sterilized = cls.STATUSES[statuses.pop()] if len(statuses) == 1 else None
+
+        mission_id = params.get('drive_id', None)
+        if mission_id:
+            if not mission_id.isdigit():
+                raise ValidationError({'error': 'Invalid drive_id'})
+            mission_id = int(mission_id)
+
+        return cls(
+            sterilized=sterilized,
+            species=params.get('species', None),
+            mission_id=mission_id or None,
+            search=params.get('q', None),
+            created_from=cls.parse_time(params, 'from'),
+            created_to=cls.parse_time(params, 'to'),
+            bbox=cls.parse_bbox(params),
+            inside_mission_area={'true': True, 'false': False}.get(params.get('inside_mission_area', '').lower()),
+        )
+
+    @staticmethod
+    def parse_bbox(params):
+        value = params.get('bbox', None)
+        if not value:
+            return None
+        try:
+            west, south, east, north = (float(part) for part in value.split(','))
+        except ValueError:
+            raise ValidationError({'error': 'Invalid bbox, expected west,south,east,north'})
+        return west, south, east, north
+
+    @staticmethod
+    def parse_time(params, name):
+        value = params.get(name, None)
+        if not value:
+            return None
+        parsed = parse_datetime(value)
+        if parsed is None:
+            raise ValidationError({'error': f'Invalid {name} timestamp'})
+        if timezone.is_naive(parsed):
+            parsed = timezone.make_aware(parsed, datetime.timezone.utc)
+        return parsed
+
+    def apply(self, queryset):
+        if self.sterilized is not None:
+            queryset = queryset.filter(sterilized=self.sterilized)
+
+        if self.species:
+            queryset = queryset.filter(species=self.species)
+
+        if self.mission_id:
+            queryset = queryset.filter(mission_id=self.mission_id)
+
+        if self.search:
+            queryset = queryset.filter(name__icontains=self.search)
+
+        if self.created_from:
+            queryset = queryset.filter(created_at__gte=self.created_from)
+
+        if self.created_to:
+            queryset = queryset.filter(created_at__lte=self.created_to)
+
+        if self.bbox:
+            # For points the bounding-box operator is exact and uses the GiST index
+            queryset = queryset.filter(location__bboverlaps=Polygon.from_bbox(self.bbox))
+
+        if self.inside_mission_area is not None:
+            queryset = queryset.filter(inside_mission_area=self.inside_mission_area)
+
+        return queryset
+
+    @property
+    def restricts_rows(self):
+        """True if filters beyond status, time and bbox apply (precomputed aggregates can't honor them)"""
+        return bool(self.species or self.mission_id or self.search or self.inside_mission_area is not None)
+
+# tiles.py
+import math
+import threading
+import time
+from collections import OrderedDict
+from django.contrib.gis.db.models import GeometryField, PointField
+from django.contrib.gis.db.models.functions import Transform
+from django.contrib.gis.geos import Polygon
+from django.core.cache import cache
+from django.db import connection, transaction
+from django.db.models import Func, Value
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from .models import Emergency, Sighting
+from .filters import SightingFilter
+
+MAX_TILE_ZOOM = 20
+
+# Keeps payloads bounded at low zooms; the hotspot aggregates cover those views
+MAX_TILE_FEATURES = 20000
+
+class TileEnvelope(Func):
+    function = 'ST_TileEnvelope'
+    output_field = GeometryField(srid=3857)
+
+class AsMVTGeom(Func):
+    function = 'ST_AsMVTGeom'
+    output_field = GeometryField(srid=3857)
+
+class MakePoint(Func):
+    """Point geometry from the lng/lat float columns of Emergency"""
+    template = 'ST_SetSRID(ST_MakePoint(%(expressions)s), 4326)'
+    output_field = PointField(srid=4326)
+
+def tile_bbox(z, x, y):
+    """The tile's extent as a lon/lat polygon, for the index-assisted && filter"""
+    n = 2 ** z
+    west = x / n * 360 - 180
+    east = (x + 1) / n * 360 - 180
+    north = math.degrees(math.atan(math.sinh(math.pi * (1 - 2 * y / n))))
+    south = math.degrees(math.atan(math.sinh(math.pi * (1 - 2 * (y + 1) / n))))
+    return Polygon.from_bbox((west, south, east, north))
+
+def tile_for_point(lng, lat, z):
+    n = 2 ** z
+    lat = max(min(lat, 85.05112878), -85.05112878)  # Web Mercator limits
+    x = int((lng + 180) / 360 * n)
+    y = int((1 - math.asinh(math.tan(math.radians(lat))) / math.pi) / 2 * n)
+    return min(max(x, 0), n - 1), min(max(y, 0), n - 1)
+
+def render_tile(queryset, layer, geometry, columns, z, x, y):
+    queryset = queryset.annotate(
+        mvt_geom=AsMVTGeom(Transform(geometry, 3857), TileEnvelope(Value(z), Value(x), Value(y)))
+    ).values('mvt_geom', *columns)[:MAX_TILE_FEATURES]
+    sql, params = queryset.query.sql_with_params()
+
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f'SELECT ST_AsMVT(tile, %s, 4096, %s) FROM ({sql}) AS tile',
+            [layer, 'mvt_geom', *params]
+        )
+        data = cursor.fetchone()[0]
+    return bytes(data) if data else b''
+
+def render_sighting_tile(params, z, x, y):
+    sightings = SightingFilter.from_params(params).apply(Sighting.objects.all())
+    sightings = sightings.filter(location__bboverlaps=tile_bbox(z, x, y))
+    return render_tile(sightings, 'sightings', 'location', ['id', 'name', 'species', 'sterilized', 'mission_id'], z, x, y)
+
+def geography_tile_area(z, x, y):
+    """The tile's extent, padded and with 1° edges so the geography index never drops a point of the tile"""
+    west, south, east, north = tile_bbox(z, x, y).extent
+    pad_x, pad_y = (east - west) / 100, (north - south) / 100
+    west, east = max(west - pad_x, -180), min(east + pad_x, 180)
+    south, north = max(south - pad_y, -90), min(north + pad_y, 90)
+    steps = max(math.ceil(east - west), 1)
+    longitudes = [west + (east - west) * step / steps for step in range(steps + 1)]
+    ring = [(lng, south) for lng in longitudes] + [(lng, north) for lng in reversed(longitudes)]
+    return Polygon(ring + [ring[0]], srid=4326)
+
+def render_emergency_tile(params, z, x, y):
+    west, south, east, north = tile_bbox(z, x, y).extent
+    emergencies = Emergency.objects.filter(
+        lat__gte=south, lat__lte=north, lng__gte=west, lng__lte=east, duplicate_of__isnull=True
+    )
+    if z > 0:
+        # Candidates come from the GiST index on location; the lat/lng ranges keep
+        # the tile edges exact. Zoom 0 is the whole world, too wide for a geography polygon.
+        emergencies = emergencies.filter(location__intersects=geography_tile_area(z, x, y))
+
+    statuses = [value for value in params.get('status', '').split(',') if value in dict(Emergency.STATUS_CHOICES)]
+    if statuses:
+        emergencies = emergencies.filter(status__in=statuses)
+    severities = [value for value in params.get('severity', '').split(',') if value]
+    if severities:
+        emergencies = emergencies.filter(severity__in=severities)
+    created_from = SightingFilter.parse_time(params, 'from')
+    if created_from:
+        emergencies = emergencies.filter(created_at__gte=created_from)
+    created_to = SightingFilter.parse_time(params, 'to')
+    if created_to:
+        emergencies = emergencies.filter(created_at__lte=created_to)
+
+    return render_tile(emergencies, 'emergencies', MakePoint('lng', 'lat'), ['id', 'title', 'severity', 'status'], z, x, y)
+
+TILE_LAYERS = {
+    'sightings': render_sighting_tile,
+    'emergencies': render_emergency_tile,
+}
+
+TILE_FILTER_PARAMS = ('status', 'species', 'severity', 'drive_id', 'q', 'from', 'to', 'bbox', 'inside_mission_area')
+
+class TileCache:
+    """Per-process LRU of rendered tiles, bounded by total bytes and keyed by shared per-tile generation tokens"""
+
+    def __init__(self, max_bytes=64 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self.size = 0
+        self.tiles = OrderedDict()
+        self.lock = threading.Lock()
+
+    @staticmethod
+    def generation_key(layer, z, x, y):
+        return f'tile-generation:{layer}:{z}:{x}:{y}'
+
+    def key(self, layer, z, x, y, params):
+        generation = cache.get(self.generation_key(layer, z, x, y), 0)
+        filters = tuple((name, params.get(name)) for name in TILE_FILTER_PARAMS if params.get(name))
+        return (layer, z, x, y, generation, filters)
+
+    def get(self, key):
+        with self.lock:
+            data = self.tiles.get(key)
+            if data is not None:
+                self.tiles.move_to_end(key)
+            return data
+
+    def set(self, key, data):
+        with self.lock:
+            if key in self.tiles:
+                return
+            self.tiles[key] = data
+            self.size += len(data)
+            while self.size > self.max_bytes:
+                _, evicted = self.tiles.popitem(last=False)
+                self.size -= len(evicted)
+
+    def invalidate_points(self, layer, points):
+        # One round trip for any number of points; nearby points share tiles
+        generation = time.time_ns()
+        keys = {
+            self.generation_key(layer, z, *tile_for_point(lng, lat, z))
+            for lng, lat in points
+            for z in range(MAX_TILE_ZOOM + 1)
+        }
+        cache.set_many({key: generation for key in keys}, timeout=None)
+
+tile_cache = TileCache()
+
+def invalidate_tiles(layer, points):
+    transaction.on_commit(lambda: tile_cache.invalidate_points(layer, points))
+
+@receiver(post_save, sender=Sighting)
+@receiver(post_delete, sender=Sighting)
+def invalidate_sighting_tiles(sender, instance, **kwargs):
+    points = {(instance.location.x, instance.location.y)}
+    old_location = getattr(instance, '_loaded_location', None)
+    if old_location is not None:
+        points.add((old_location.x, old_location.y))
+    invalidate_tiles('sightings', points)
+    instance._loaded_location = instance.location
+
+@receiver(post_save, sender=Emergency)
+@receiver(post_delete, sender=Emergency)
+def invalidate_emergency_tiles(sender, instance, **kwargs):
+    # Emergencies never move, but status and severity are tile attributes
+    invalidate_tiles('emergencies', {(instance.lng, instance.lat)})
+
+# aggregates.py
+import copy
+import datetime
+import math
+from django.contrib.gis.db.models.functions import GeoHash
+from django.db.models import Count, Q, Sum
+from django.utils import timezone
+from rest_framework.exceptions import ValidationError
+from .models import HotspotCell, HotspotDay, Sighting
+
+# Geohash precision per map zoom: cells of roughly 20-60 screen pixels
+ZOOM_PRECISIONS = [2, 2, 2, 3, 3, 3, 4, 4, 5, 5, 5, 6, 6, 7, 7, 7, 8]
+
+# Precisions kept per day in HotspotCell; finer zooms cover small areas and
+# are aggregated live
+PRECOMPUTED_PRECISIONS = (2, 3, 4, 5)
+
+GEOHASH_BASE32 = '0123456789bcdefghjkmnpqrstuvwxyz'
+
+def geohash_center(cell):
+    """Return (lat, lng) of the centre of a geohash cell"""
+    lat_range, lng_range = [-90.0, 90.0], [-180.0, 180.0]
+    even = True
+    for char in cell:
+        bits = GEOHASH_BASE32.index(char)
+        for shift in range(4, -1, -1):
+            bounds = lng_range if even else lat_range
+            middle = (bounds[0] + bounds[1]) / 2
+            bounds[0 if bits >> shift & 1 else 1] = middle
+            even = not even
+    return (lat_range[0] + lat_range[1]) / 2, (lng_range[0] + lng_range[1]) / 2
+
+def zoom_param(params):
+    """The zoom query param as an int, or None when absent"""
+    zoom = params.get('zoom')
+    if zoom is not None and not zoom.isdigit():
+        raise ValidationError({'error': 'Invalid zoom'})
+    return int(zoom) if zoom else None
+
+def zoom_for_bbox(bbox):
+    """Approximate map zoom for a viewport about 1000 pixels wide"""
+    width = (bbox[2] - bbox[0]) % 360 or 360
+    return min(max(round(math.log2(360 / width)) + 2, 0), len(ZOOM_PRECISIONS) - 1)
+
+def grouped_cells(sightings, precision):
+    """One grouped query: (cell, count, sterilized) per geohash cell"""
+    return sightings.annotate(cell=GeoHash('location', precision=precision)).values('cell').annotate(
+        count=Count('id'),
+        sterilized=Count('id', filter=Q(sterilized=True)),
+    ).values_list('cell', 'count', 'sterilized').order_by()
+
+def midnight(moment):
+    return moment.replace(hour=0, minute=0, second=0, microsecond=0)
+
+def day_runs(days):
+    """Sorted dates as [start, end) UTC datetime ranges of consecutive days"""
+    runs = []
+    for day in days:
+        start = datetime.datetime.combine(day, datetime.time.min, tzinfo=datetime.timezone.utc)
+        if runs and runs[-1][1] == start:
+            runs[-1][1] = start + timezone.timedelta(days=1)
+        else:
+            runs.append([start, start + timezone.timedelta(days=1)])
+    return runs
+
+def hotspot_overview(sighting_filter, zoom=None):
+    """Totals and normalized hotspot intensities for the home map, from precomputed cells where possible"""
+    now = timezone.now()
+    created_from = (sighting_filter.created_from or now - timezone.timedelta(days=7)).astimezone(datetime.timezone.utc)
+    created_to = (sighting_filter.created_to or now).astimezone(datetime.timezone.utc)
+    if zoom is None:
+        zoom = zoom_for_bbox(sighting_filter.bbox) if sighting_filter.bbox else 3
+    precision = ZOOM_PRECISIONS[min(max(zoom, 0), len(ZOOM_PRECISIONS) - 1)]
+
+    # Rows of every status are aggregated; the status filter only picks which
+    # count drives the intensity, so the totals still break down by status
+    rows_filter = copy.copy(sighting_filter)
+    rows_filter.sterilized = None
+    sightings = rows_filter.apply(Sighting.objects.all())
+    sightings = sightings.filter(created_at__gte=created_from, created_at__lte=created_to)
+    cells = {}
+
+    if precision in PRECOMPUTED_PRECISIONS and not sighting_filter.restricts_rows:
+        # Whole UTC days [first_day, end_day) in the window, and those of them rebuilt
+        first_day = midnight(created_from)
+        if first_day < created_from:
+            first_day += timezone.timedelta(days=1)
+        end_day = midnight(created_to)
+        covered = []
+        if first_day < end_day:
+            covered = list(HotspotDay.objects.filter(
+                day__gte=first_day.date(), day__lt=end_day.date()
+            ).values_list('day', flat=True).order_by('day'))
+
+        if covered:
+            precomputed = HotspotCell.objects.filter(precision=precision, day__in=covered)
+            if sighting_filter.bbox:
+                west, south, east, north = sighting_filter.bbox
+                precomputed = precomputed.filter(lng__gte=west, lng__lte=east, lat__gte=south, lat__lte=north)
+            for cell, count, sterilized in precomputed.values('cell').annotate(
+                total=Sum('count'), total_sterilized=Sum('sterilized_count')
+            ).values_list('cell', 'total', 'total_sterilized').order_by():
+                cells[cell] = [count, sterilized]
+
+            # Edge partial days and days never rebuilt are read from raw rows
+            for start, end in day_runs(covered):
+                sightings = sightings.exclude(created_at__gte=start, created_at__lt=end)
+
+    for cell, count, sterilized in grouped_cells(sightings, precision):
+        totals = cells.setdefault(cell, [0, 0])
+        totals[0] += count
+        totals[1] += sterilized
+
+    # Intensity follows the status filter: sterilized, active or all sightings
+    def weight(count, sterilized):
+        if sighting_filter.sterilized is None:
+            return count
+        return sterilized if sighting_filter.sterilized else count - sterilized
+
+    total = sum(count for count, _ in cells.values())
+    sterilized_total = sum(sterilized for _, sterilized in cells.values())
+    peak = max((weight(*totals) for totals in cells.values()), default=0)
+
+    hotspots = []
+    for cell, totals in cells.items():
+        if weight(*totals):
+            lat, lng = geohash_center(cell)
+            hotspots.append({'lat': lat, 'lng': lng, 'intensity': round(weight(*totals) / peak, 4)})
+
+    return {
+        'total_sightings': total,
+        'sterilized': sterilized_total,
+        'active': total - sterilized_total,
+        'hotspots': hotspots,
+    }
+
+# trends.py
+import datetime
+from django.db.models import Case, Count, F, Value, When
+from django.db.models.functions import Trunc
+from django.utils import timezone
+from rest_framework.exceptions import ValidationError
+from .filters import SightingFilter
+
+TREND_BUCKETS = {
+    'hour': datetime.timedelta(hours=1),
+    'day': datetime.timedelta(days=1),
+    'week': datetime.timedelta(weeks=1),
+}
+
+# Keeps responses chart-sized: a year of days or ten years of weeks fit
+MAX_TREND_BUCKETS = 4000
+
+DEFAULT_TREND_RANGE = datetime.timedelta(days=30)
+
+SIGHTING_TREND_GROUPS = {
+    # Same names as SightingFilter's status parameter
+    'status': Case(When(sterilized=True, then=Value('sterilized')), default=Value('active')),
+    'species': F('species'),
+    'mission': F('mission_id'),
+}
+
+EMERGENCY_TREND_GROUPS = {
+    'severity': F('severity'),
+    'status': F('status'),
+}
+
+def bucket_start(moment, bucket):
+    moment = moment.astimezone(datetime.timezone.utc).replace(minute=0, second=0, microsecond=0)
+    if bucket != 'hour':
+        moment = moment.replace(hour=0)
+    if bucket == 'week':
+        moment -= datetime.timedelta(days=moment.weekday())  # date_trunc weeks start on Monday
+    return moment
+
+def trend_series(queryset, time_field, params, groups, default_group):
+    """Counts per UTC time bucket and group, read with a single GROUP BY per queryset"""
+    bucket = params.get('bucket', 'day')
+    if bucket not in TREND_BUCKETS:
+        raise ValidationError({'error': 'Invalid bucket, expected hour, day or week'})
+
+    group_by = params.get('group_by', default_group)
+    if group_by not in groups:
+        raise ValidationError({'error': f"Invalid group_by, expected one of {', '.join(groups)}"})
+
+    end = SightingFilter.parse_time(params, 'to') or timezone.now()
+    start = SightingFilter.parse_time(params, 'from') or end - DEFAULT_TREND_RANGE
+    if start >= end:
+        raise ValidationError({'error': 'from must be before to'})
+    if (end - start) / TREND_BUCKETS[bucket] > MAX_TREND_BUCKETS:
+        raise ValidationError({'error': f'Too many {bucket} buckets; use a coarser bucket or a shorter range'})
+
+    counts = {}
+    for source in queryset if isinstance(queryset, (list, tuple)) else [queryset]:
+        rows = source.filter(**{f'{time_field}__gte': start, f'{time_field}__lte': end}).annotate(
+            bucket=Trunc(time_field, bucket, tzinfo=datetime.timezone.utc)
+        ).values('bucket', group=groups[group_by]).annotate(count=Count('id')).order_by()
+        for row in rows:
+            bucket_counts = counts.setdefault(row['bucket'], {})
+            group = str(row['group'])
+            bucket_counts[group] = bucket_counts.get(group, 0) + row['count']
+
+    series = []
+    moment = bucket_start(start, bucket)
+    while moment <= end:
+        bucket_counts = counts.get(moment, {})
+        series.append({
+            'start': moment.isoformat(),
+            'total': sum(bucket_counts.values()),
+            'counts': bucket_counts,
+        })
+        moment += TREND_BUCKETS[bucket]
+
+    return {
+        'bucket': bucket,
+        'group_by': group_by,
+        'field': time_field,
+        'from': start.isoformat(),
+        'to': end.isoformat(),
+        'groups': sorted({group for bucket_counts in counts.values() for group in bucket_counts}),
+        'series': series,
+    }
+
+# snapshot.py
+from django.contrib.gis.geos import Polygon
+from django.db import connection
+from django.db.models import FloatField, Func, JSONField, Q
+from django.utils import timezone
+from .models import MISSION_POLYGON_FIELDS, Emergency, Mission, Sighting
+from .aggregates import hotspot_overview
+
+# Rows per layer in one snapshot; denser views are served by the vector tiles
+SNAPSHOT_SIGHTING_LIMIT = 1000
+SNAPSHOT_EMERGENCY_LIMIT = 500
+SNAPSHOT_MISSION_LIMIT = 200
+
+class AsGeoJSONObject(Func):
+    """ST_AsGeoJSON as a json value, so it nests inside json_agg rows"""
+    function = 'ST_AsGeoJSON'
+    template = '%(function)s(%(expressions)s)::json'
+    output_field = JSONField()
+
+def coordinate(axis):
+    return Func('location', function=f'ST_{axis}', output_field=FloatField())
+
+def json_rows(querysets):
+    """Run several .values() querysets as a single statement: {name: [row dicts]}"""
+    selects, params = [], []
+    for queryset in querysets.values():
+        sql, query_params = queryset.query.sql_with_params()
+        selects.append(f"(SELECT coalesce(json_agg(row_to_json(rows)), '[]'::json) FROM ({sql}) AS rows)")
+        params.extend(query_params)
+
+    with connection.cursor() as cursor:
+        cursor.execute('SELECT ' + ', '.join(selects), params)
+        return dict(zip(querysets, cursor.fetchone()))
+
+def map_snapshot(sighting_filter, severities=None, zoom=None, detail='low'):
+    """Home map sightings, drives, emergencies and statistics: one statement plus hotspot_overview's one to three"""
+    sightings = sighting_filter.apply(Sighting.objects.all()).annotate(
+        lat=coordinate('Y'), lng=coordinate('X')
+    ).order_by('-created_at', '-id').values(
+        'id', 'lat', 'lng', 'created_at', 'sterilized', 'species', 'mission_id'
+    )[:SNAPSHOT_SIGHTING_LIMIT + 1]
+
+    # Drives are missions: undated or dated today or later
+    missions = Mission.objects.filter(
+        Q(date__isnull=True) | Q(date__gte=timezone.now().date())
+    ).annotate(geometry=AsGeoJSONObject(MISSION_POLYGON_FIELDS[detail])).order_by('date', 'id').values(
+        'id', 'title', 'center_lat', 'center_lon', 'date', 'geometry'
+    )[:SNAPSHOT_MISSION_LIMIT]
+
+    emergencies = Emergency.objects.exclude(status__in=['resolved', 'closed']).filter(duplicate_of__isnull=True)
+    if severities:
+        emergencies = emergencies.filter(severity__in=severities)
+    emergencies = emergencies.order_by('-created_at').values(
+        'id', 'title', 'description', 'lat', 'lng', 'severity', 'status', 'photo_url', 'created_at'
+    )[:SNAPSHOT_EMERGENCY_LIMIT + 1]
+
+    if sighting_filter.bbox:
+        west, south, east, north = sighting_filter.bbox
+        # Missions without a polygon (or not yet backfilled) have no bbox and are kept
+        missions = missions.filter(
+            Q(bbox_west__isnull=True)
+            | Q(bbox_west__lte=east, bbox_east__gte=west, bbox_south__lte=north, bbox_north__gte=south)
+        )
+        # GiST index on location
+        emergencies = emergencies.filter(location__intersects=Polygon.from_bbox(sighting_filter.bbox))
+
+    rows = json_rows({'sightings': sightings, 'missions': missions, 'emergencies': emergencies})
+
+    return {
+        'sightings': [
+            {
+                'id': row['id'],
+                'location': {'lat': row['lat'], 'lng': row['lng']},
+                'timestamp': row['created_at'],
+                'status': 'sterilized' if row['sterilized'] else 'active',
+                'species': row['species'],
+                'mission_id': row['mission_id'],
+            }
+            for row in rows['sightings'][:SNAPSHOT_SIGHTING_LIMIT]
+        ],
+        'drives': [
+            {
+                'id': row['id'],
+                'title': row['title'],
+                'center': {'lat': row['center_lat'], 'lng': row['center_lon']},
+                'polygon': row['geometry'],
+                'date': row['date'],
+                'status': 'active',
+            }
+            for row in rows['missions']
+        ],
+        'emergencies': rows['emergencies'][:SNAPSHOT_EMERGENCY_LIMIT],
+        'statistics': hotspot_overview(sighting_filter, zoom),
+        'truncated': {
+            'sightings': len(rows['sightings']) > SNAPSHOT_SIGHTING_LIMIT,
+            'emergencies': len(rows['emergencies']) > SNAPSHOT_EMERGENCY_LIMIT,
+        },
+    }
+
+# ingest.py
+import datetime
+from collections import defaultdict
+from django.db import connection, transaction
+from .models import HotspotDay, Mission, Sighting, bump_mission_rollup
+from .serializers import BulkSightingSerializer
+from .tiles import invalidate_tiles
+from .caching import bump_versions
+
+MAX_BULK_SIGHTINGS = 5000
+
+def points_inside_missions(rows):
+    """Indexes of (index, mission_id, point) rows inside their mission's polygon, in one query"""
+    if not rows:
+        return set()
+    values = ', '.join(['(%s::integer, %s::integer, ST_GeomFromEWKB(%s))'] * len(rows))
+    params = [value for index, mission_id, point in rows for value in (index, mission_id, bytes(point.ewkb))]
+    with connection.cursor() as cursor:
+        cursor.execute(f"""
+            SELECT v.idx FROM (VALUES {values}) AS v(idx, mission_id, geom)
+            JOIN {Mission._meta.db_table} m ON m.id = v.mission_id
+            WHERE m.polygon IS NULL OR ST_Within(v.geom, m.polygon)
+        """, params)
+        return {row[0] for row in cursor.fetchall()}
+
+def ingest_sightings(items, user=None):
+    """Validate and insert a batch of sightings; returns one result per item, in order"""
+    results = [None] * len(items)
+    valid = []
+    for index, item in enumerate(items):
+        serializer = BulkSightingSerializer(data=item)
+        if serializer.is_valid():
+            valid.append((index, serializer.validated_data))
+        else:
+            results[index] = {'index': index, 'status': 'invalid', 'errors': serializer.errors}
+
+    mission_ids = set(Mission.objects.filter(
+        id__in={data['mission'] for _, data in valid}
+    ).values_list('id', flat=True))
+    stored_keys = dict(Sighting.objects.filter(
+        user=user, idempotency_key__in=[data['idempotency_key'] for _, data in valid if data.get('idempotency_key')]
+    ).values_list('idempotency_key', 'id'))
+
+    pending = []
+    first_with_key = {}
+    repeated = []
+    for index, data in valid:
+        key = data.get('idempotency_key')
+        if data['mission'] not in mission_ids:
+            results[index] = {'index': index, 'status': 'invalid', 'errors': {'mission': ['Mission not found']}}
+        elif key in stored_keys:
+            results[index] = {'index': index, 'status': 'duplicate', 'id': stored_keys[key]}
+        elif key and key in first_with_key:
+            repeated.append((index, first_with_key[key]))
+        else:
+            if key:
+                first_with_key[key] = index
+            pending.append((index, data))
+
+    inside = points_inside_missions([(index, data['mission'], data['location']) for index, data in pending])
+
+    with transaction.atomic():
+        created = Sighting.objects.bulk_create([
+            Sighting(
+                mission_id=data['mission'], name=data['name'], species=data['species'],
+                sterilized=data['sterilized'], location=data['location'],
+                idempotency_key=data.get('idempotency_key'), user=user, inside_mission_area=index in inside,
+            )
+            for index, data in pending
+        ], batch_size=1000)
+
+        counts = defaultdict(lambda: [0, 0])
+        for sighting in created:
+            if not sighting.inside_mission_area:
+                continue
+            counts[sighting.mission_id][0] += 1
+            counts[sighting.mission_id][1] += int(sighting.sterilized)
+        for mission_id, (total, sterilized) in counts.items():
+            bump_mission_rollup(mission_id, total=total, sterilized=sterilized)
+        invalidate_tiles('sightings', {(sighting.location.x, sighting.location.y) for sighting in created})
+        HotspotDay.objects.filter(
+            day__in={sighting.created_at.astimezone(datetime.timezone.utc).date() for sighting in created}
+        ).delete()
+        bump_versions(f'mission:{sighting.mission_id}' for sighting in created)
+
+    for (index, _), sighting in zip(pending, created):
+        results[index] = {
+            'index': index, 'status': 'created', 'id': sighting.id,
+            'inside_mission_area': index in inside,
+        }
+    for index, first_index in repeated:
+        results[index] = {'index': index, 'status': 'duplicate', 'id': results[first_index]['id']}
+
+    return results
+
+# instrumentation.py
+import logging
+import threading
+import time
+from contextlib import ExitStack
+from django.conf import settings
+from django.db import connections
+
+logger = logging.getLogger(__name__)
+
+class QueryBudgetExceeded(AssertionError):
+    pass
+
+def resolve_view(view_func, method):
+    """(view class, viewset action) of a resolved view; DRF view functions carry both"""
+    actions = getattr(view_func, 'actions', None) or {}
+    return getattr(view_func, 'cls', None), actions.get(method.lower())
+
+class QueryRecorder:
+    """execute_wrapper that counts queries and the time spent waiting on them"""
+
+    def __init__(self):
+        self.count = 0
+        self.seconds = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.count += 1
+            self.seconds += time.perf_counter() - started
+
+class EndpointMetrics:
+    """Per-process totals for each view/action, served by the metrics endpoint"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.endpoints = {}
+
+    def record(self, endpoint, queries, db_ms, serialize_ms, over_budget):
+        with self.lock:
+            stats = self.endpoints.setdefault(endpoint, {
+                'requests': 0, 'queries': 0, 'max_queries': 0,
+                'db_ms': 0.0, 'serialize_ms': 0.0, 'over_budget': 0,
+            })
+            stats['requests'] += 1
+            stats['queries'] += queries
+            stats['max_queries'] = max(stats['max_queries'], queries)
+            stats['db_ms'] += db_ms
+            stats['serialize_ms'] += serialize_ms
+            stats['over_budget'] += int(over_budget)
+
+    def snapshot(self):
+        with self.lock:
+            return {
+                endpoint: {
+                    'requests': stats['requests'],
+                    'avg_queries': round(stats['queries'] / stats['requests'], 2),
+                    'max_queries': stats['max_queries'],
+                    'avg_db_ms': round(stats['db_ms'] / stats['requests'], 2),
+                    'avg_serialize_ms': round(stats['serialize_ms'] / stats['requests'], 2),
+                    'over_budget': stats['over_budget'],
+                }
+                for endpoint, stats in self.endpoints.items()
+            }
+
+endpoint_metrics = EndpointMetrics()
+
+class QueryInstrumentationMiddleware:
+    """Records queries, DB time and serialization time per view and action, and checks query_budgets"""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        recorder = request._query_recorder = QueryRecorder()
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(recorder))
+            response = self.get_response(request)
+
+        view = getattr(request, '_instrumented_view', None)
+        if view is None:
+            return response
+
+        endpoint, view_class, action, view_started, db_seconds_before = view
+        db_ms = recorder.seconds * 1000
+        view_ms = (time.perf_counter() - view_started) * 1000
+        serialize_ms = max(view_ms - (recorder.seconds - db_seconds_before) * 1000, 0)
+        budget = getattr(view_class, 'query_budgets', {}).get(action)
+        over_budget = budget is not None and recorder.count > budget
+
+        endpoint_metrics.record(endpoint, recorder.count, db_ms, serialize_ms, over_budget)
+        response['X-Query-Count'] = str(recorder.count)
+        response['Server-Timing'] = f'db;dur={db_ms:.1f}, serialize;dur={serialize_ms:.1f}'
+
+        if over_budget:
+            message = f'{endpoint} ran {recorder.count} queries, budget is {budget}'
+            if getattr(settings, 'QUERY_BUDGET_ENFORCE', False):
+                raise QueryBudgetExceeded(message)
+            logger.warning(message)
+
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        view_class, action = resolve_view(view_func, request.method)
+        name = view_class.__name__ if view_class else view_func.__name__
+        endpoint = f'{name}.{action}' if action else name
+
+        request._instrumented_view = (
+            endpoint, view_class, action, time.perf_counter(), request._query_recorder.seconds
+        )
+        return None
+
+def query_budget(budget):
+    """query_budgets for an @api_view function view; apply it above @api_view"""
+    def decorator(view):
+        view.cls.query_budgets = {None: budget}
+        return view
+    return decorator
+
+class QueryBudgetTestMixin:
+    """Harness for APITestCase subclasses: fail when an endpoint exceeds its query budget"""
+
+    def assertWithinQueryBudget(self, url, **extra):
+        with self.settings(QUERY_BUDGET_ENFORCE=True):
+            # The test client re-raises QueryBudgetExceeded from the middleware
+            response = self.client.get(url, **extra)
+        self.assertLess(response.status_code, 400, f'{url} returned {response.status_code}')
+        return response
+
+# replicas.py
+import hashlib
+import random
+from contextlib import contextmanager
+from contextvars import ContextVar
+from django.conf import settings
+from django.core.cache import cache
+from .instrumentation import resolve_view
+
+# A client that wrote reads from the primary this long afterwards, and so do
+# conditional responses for resources changed this recently; replica lag is
+# expected to stay well below it.
+REPLICA_PIN_SECONDS = 5
+
+READ_METHODS = ('GET', 'HEAD')
+WRITE_METHODS = ('POST', 'PUT', 'PATCH', 'DELETE')
+
+# Users, sessions and tokens authenticate every request, including the first
+# ones with a credential just issued by a login or token write, which no pin
+# covers; they are always read from the primary
+PRIMARY_APP_LABELS = {'auth', 'sessions', 'authtoken'}
+
+# Alias that reads of the current request go to; None means the primary
+_read_database = ContextVar('read_database', default=None)
+
+def replica_aliases():
+    """Database aliases that serve reads, from settings.DATABASE_REPLICAS"""
+    return getattr(settings, 'DATABASE_REPLICAS', [])
+
+@contextmanager
+def primary_reads():
+    """Read from the primary inside the block, whatever the request was routed to"""
+    token = _read_database.set(None)
+    try:
+        yield
+    finally:
+        _read_database.reset(token)
+
+def credential_key(credential):
+    return hashlib.sha1(credential.encode()).hexdigest() if credential else None
+
+def client_key(request):
+    """Identifies a client across requests by its Authorization header or session cookie"""
+    return credential_key(request.headers.get('Authorization') or request.COOKIES.get(settings.SESSION_COOKIE_NAME))
+
+def pin_key(client):
+    return f'primary-pin:{client}'
+
+class ReplicaRouter:
+    """Sends reads to the replica ReplicaRoutingMiddleware picked for this request, everything else to the primary"""
+
+    def db_for_read(self, model, **hints):
+        if model._meta.app_label in PRIMARY_APP_LABELS:
+            return None
+        return _read_database.get()
+
+    def db_for_write(self, model, **hints):
+        return 'default'
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Replicas hold the same rows as the primary
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db not in replica_aliases()
+
+class ReplicaRoutingMiddleware:
+    """Serves a view's `replica_actions` from a replica, except to clients pinned by a recent write"""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        try:
+            response = self.get_response(request)
+        finally:
+            _read_database.set(None)
+
+        if request.method in WRITE_METHODS and response.status_code < 400:
+            # A login answers with a new session cookie: pin that client too
+            issued = response.cookies.get(settings.SESSION_COOKIE_NAME)
+            clients = {client_key(request), credential_key(issued.value if issued else None)} - {None}
+            if clients:
+                cache.set_many({pin_key(client): True for client in clients}, REPLICA_PIN_SECONDS)
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        replicas = replica_aliases()
+        if not replicas or request.method not in READ_METHODS:
+            return None
+        view_class, action = resolve_view(view_func, request.method)
+        if action not in getattr(view_class, 'replica_actions', ()):
+            return None
+        client = client_key(request)
+        if client is None or not cache.get(pin_key(client)):
+            _read_database.set(random.choice(replicas))
+        return None
+
+# caching.py
+import functools
+import hashlib
+import time
+from django.core.cache import cache, caches
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from rest_framework import status
+from rest_framework.response import Response
+from .models import Emergency, Mission, Sighting
+from .replicas import REPLICA_PIN_SECONDS, primary_reads
+
+# Versions expire so keys of deleted missions do not pile up; an expired
+# version simply starts over, costing each client one full response
+VERSION_TIMEOUT = 7 * 24 * 60 * 60
+
+def version_key(resource):
+    return f'resource-version:{resource}'
+
+def resource_version(resource, create=True):
+    """Version token of a resource, shared by all workers; None if absent and not created, or uncacheable"""
+    version = cache.get(version_key(resource))
+    if version is None and create:
+        cache.add(version_key(resource), time.time_ns(), timeout=VERSION_TIMEOUT)
+        version = cache.get(version_key(resource))
+    return version
+
+def mission_row_resource(mission_id):
+    """Version of the Mission row alone (see MissionCache); mission:{id} also moves with its sightings"""
+    return f'mission-row:{mission_id}'
+
+def bump_versions(resources):
+    """Give each resource a new version once the current transaction commits"""
+    resources = set(resources)
+    if resources:
+        transaction.on_commit(
+            lambda: cache.set_many(
+                {version_key(resource): time.time_ns() for resource in resources}, timeout=VERSION_TIMEOUT
+            )
+        )
+
+def conditional_response(resource, per_minute=False):
+    """ETag / If-None-Match handling and a local response cache for a read-only action"""
+    def decorator(view_method):
+        @functools.wraps(view_method)
+        def wrapper(self, request, *args, **kwargs):
+            name = resource.format(**kwargs)
+            version = resource_version(name, create=False)
+            if version is None:
+                # No ETag without a version. Versioning starts only once the view
+                # has found the object, and this body, read before that, is not cached
+                with primary_reads():
+                    response = view_method(self, request, *args, **kwargs)
+                if response.status_code == status.HTTP_200_OK:
+                    resource_version(name)
+                return response
+
+            parts = [
+                name,
+                str(version),
+                request.path,
+                repr(sorted(request.query_params.lists())),
+                request.accepted_renderer.format,
+                str(int(time.time() // 60)) if per_minute else '',
+            ]
+            etag = '"%s"' % hashlib.sha1('|'.join(parts).encode()).hexdigest()
+
+            if etag in request.headers.get('If-None-Match', ''):
+                response = Response(status=status.HTTP_304_NOT_MODIFIED)
+            else:
+                data = caches['responses'].get(etag)
+                if data is not None:
+                    response = Response(data)
+                else:
+                    # A lagging replica would store the old body under the new ETag
+                    if time.time_ns() - version < REPLICA_PIN_SECONDS * 1_000_000_000:
+                        with primary_reads():
+                            response = view_method(self, request, *args, **kwargs)
+                    else:
+                        response = view_method(self, request, *args, **kwargs)
+                    if response.status_code != status.HTTP_200_OK:
+                        return response
+                    caches['responses'].set(etag, response.data)
+
+            response['ETag'] = etag
+            # Clients may keep the body but must revalidate before every use
+            response['Cache-Control'] = 'private, no-cache'
+            return response
+        return wrapper
+    return decorator
+
+@receiver(post_save, sender=Mission)
+@receiver(post_delete, sender=Mission)
+def bump_mission_version(sender, instance, **kwargs):
+    bump_versions([f'mission:{instance.id}', mission_row_resource(instance.id)])
+
+@receiver(post_save, sender=Sighting)
+@receiver(post_delete, sender=Sighting)
+def bump_sighting_mission_version(sender, instance, **kwargs):
+    mission_ids = {instance.mission_id}
+    counted = getattr(instance, '_counted', None)
+    if counted:
+        # A sighting moved to another mission changes both dashboards
+        mission_ids.add(counted[0])
+    bump_versions(f'mission:{mission_id}' for mission_id in mission_ids)
+
+@receiver(post_save, sender=Emergency)
+@receiver(post_delete, sender=Emergency)
+def bump_emergency_version(sender, instance, **kwargs):
+    # create, assign and update_status all save the row
+    bump_versions(['emergencies'])
+
+# mission_cache.py
+import copy
+import threading
+from collections import OrderedDict
+from django.http import Http404
+from .models import Mission
+from .caching import mission_row_resource, resource_version
+from .replicas import primary_reads
+
+class MissionCache:
+    """Per-process LRU of Mission rows, with their polygons prepared for contains()"""
+
+    def __init__(self, max_entries=1024):
+        self.max_entries = max_entries
+        self.missions = OrderedDict()
+        self.lock = threading.Lock()
+        self.hits = self.misses = self.evictions = 0
+
+    def get(self, mission_id):
+        """A copy of the mission for the caller to use freely; Http404 if it does not exist"""
+        if isinstance(mission_id, str) and mission_id.isdecimal():
+            mission_id = int(mission_id)
+        if isinstance(mission_id, bool) or not isinstance(mission_id, int):
+            raise Http404('No Mission matches the given query.')
+
+        # Read before the row, so a save landing in between is caught next time
+        version = resource_version(mission_row_resource(mission_id), create=False)
+        with self.lock:
+            entry = self.missions.get(mission_id)
+            if entry is not None and version is not None and entry[0] == version:
+                self.missions.move_to_end(mission_id)
+                self.hits += 1
+                return copy.copy(entry[1])
+            self.misses += 1
+
+        # A lagging replica would pin the old row to the new version
+        with primary_reads():
+            mission = Mission.objects.filter(id=mission_id).first()
+        if mission is None:
+            raise Http404('No Mission matches the given query.')
+        if version is None:
+            # The row exists, so start versioning it; this copy was read before
+            # the version, so only the next lookup may be cached
+            resource_version(mission_row_resource(mission_id))
+            return mission
+
+        with self.lock:
+            # Every thread shares the prepared polygon, and GEOS builds its index
+            # lazily and unlocked: build it here, before anyone else can see it
+            mission._prepared_polygon = None
+            if mission.polygon:
+                prepared = mission.polygon.prepared
+                prepared.contains(mission.polygon.point_on_surface)
+                mission._prepared_polygon = prepared
+            self.missions[mission_id] = (version, mission)
+            self.missions.move_to_end(mission_id)
+            while len(self.missions) > self.max_entries:
+                self.missions.popitem(last=False)
+                self.evictions += 1
+        return copy.copy(mission)
+
+    def stats(self):
+        with self.lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self.missions),
+                'max_entries': self.max_entries,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_rate': round(self.hits / lookups, 3) if lookups else None,
+            }
+
+mission_cache = MissionCache()
+
+# apps.py
+from django.apps import AppConfig
+
+class MyAppConfig(AppConfig):
+    name = 'myapp'
+
+    def ready(self):
+        # Registers the tile and response cache invalidation and watch-area alert receivers
+        from . import alerts, caching, tiles  # noqa: F401
+
+# renderers.py
+from rest_framework.renderers import JSONRenderer
+
+try:
+    import orjson
+except ImportError:  # optional; JSONRenderer's json.dumps is used instead
+    orjson = None
+
+class FastJSONRenderer(JSONRenderer):
+    """JSONRenderer that encodes with orjson when it is installed"""
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if (
+            orjson is None or data is None or self.ensure_ascii or not self.compact
+            or self.get_indent(accepted_media_type, renderer_context or {})
+        ):
+            return super().render(data, accepted_media_type, renderer_context)
+        rendered = orjson.dumps(
+            data,
+            default=self.encoder_class().default,
+            option=orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS,
+        )
+        return rendered.replace('\u2028'.encode(), b'\\u2028').replace('\u2029'.encode(), b'\\u2029')
+
+class StreamedExportRenderer(JSONRenderer):
+    """Lets content negotiation accept a streamed export's media type"""
+
+class GeoJSONExportRenderer(StreamedExportRenderer):
+    media_type = 'application/geo+json'
+    format = 'geojson'
+
+class NDJSONExportRenderer(StreamedExportRenderer):
+    media_type = 'application/x-ndjson'
+    format = 'ndjson'
+
+# pagination.py
+from rest_framework.pagination import CursorPagination
+
+class SightingCursorPagination(CursorPagination):
+    """Keyset pagination: every page is an index range scan, with no COUNT or OFFSET"""
+    ordering = ('-created_at', '-id')
+    page_size = 100
+    page_size_query_param = 'limit'
+    max_page_size = 1000
+
 # views.py
-from rest_framework import viewsets, status
-from rest_framework.decorators import action
+from rest_framework import viewsets, status, permissions
+from rest_framework.decorators import action, api_view, permission_classes
 from rest_framework.response import Response
 from django.contrib.gis.geos import Point, Polygon
 from django.contrib.gis.db.models import Q
-from .models import Mission, Sighting
-from .serializers import MissionSerializer, SightingSerializer, MissionStatisticsSerializer
+from django.contrib.gis.db.models.functions import AsGeoJSON
+from django.db import IntegrityError
+from django.http import HttpResponse, StreamingHttpResponse
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from .models import Mission, Sighting, SightingTombstone
+import datetime
+import json
+import logging
+import time
+from rest_framework.renderers import BrowsableAPIRenderer
+from .serializers import (
+    MissionSerializer, SightingSerializer, MissionStatisticsSerializer, geometry_detail, mission_rows, mission_values
+)
+from .renderers import FastJSONRenderer, GeoJSONExportRenderer, NDJSONExportRenderer
+from .filters import SightingFilter
+from .pagination import SightingCursorPagination
+from .tiles import MAX_TILE_ZOOM, TILE_LAYERS, tile_cache
+from .aggregates import hotspot_overview, zoom_param
+from .ingest import MAX_BULK_SIGHTINGS, ingest_sightings
+from .instrumentation import endpoint_metrics, query_budget
+from .mission_cache import mission_cache
+from .caching import conditional_response
+from .trends import SIGHTING_TREND_GROUPS, trend_series
+from .snapshot import map_snapshot
+
+logger = logging.getLogger(__name__)
+
+# A sighting saved just before a cursor was issued may commit just after it, so
+# delta queries look back a little past the cursor. Clients upsert by id, so the
+# overlap only costs a few repeated features.
+DELTA_CURSOR_OVERLAP = timezone.timedelta(seconds=5)
+
+def format_cursor(moment):
+    """UTC ISO 8601 with a Z suffix, so the cursor needs no URL encoding in ?since="""
+    return moment.astimezone(datetime.timezone.utc).isoformat().replace('+00:00', 'Z')
+
+# Tombstones older than this are pruned (see prune_sighting_tombstones); a
+# cursor older than this gets a full snapshot instead of a delta.
+TOMBSTONE_RETENTION = timezone.timedelta(days=7)
+
+# Rows fetched per round trip from the server-side cursor used by exports
+EXPORT_CHUNK_SIZE = 2000
+
+EXPORT_CONTENT_TYPES = {
+    'geojson': 'application/geo+json',
+    'ndjson': 'application/x-ndjson',
+}
+
+def sighting_feature(sighting):
+    return {
+        'type': 'Feature',
+        'geometry': {
+            'type': 'Point',
+            'coordinates': sighting.coordinates
+        },
+        'properties': {
+            'id': sighting.id,
+            'name': sighting.name,
+            'sterilized': sighting.sterilized,
+            'created_at': sighting.created_at.isoformat()
+        }
+    }
 
 class MissionViewSet(viewsets.ModelViewSet):
     queryset = Mission.objects.all().order_by('-created_at')
     serializer_class = MissionSerializer
+    # Max queries per request, authentication included (see QueryInstrumentationMiddleware)
+    query_budgets = {'dashboard': 6, 'sightings': 4, 'statistics': 4, 'trends': 4}
+    # Polling reads served by a replica (see ReplicaRoutingMiddleware); exports stream
+    # after the middleware returns, so they stay on the primary
+    replica_actions = {'list', 'retrieve', 'dashboard', 'sightings', 'statistics', 'trends'}
+    # Read-only detail actions that take the mission from MissionCache
+    cached_object_actions = {'dashboard', 'statistics', 'sightings', 'trends', 'export_sightings'}
+    renderer_classes = [FastJSONRenderer, BrowsableAPIRenderer]
+
+    def get_renderers(self):
+        renderers = super().get_renderers()
+        if self.action == 'export_sightings':
+            # Clients asking for the export's own media type would otherwise get a 406
+            renderers += [GeoJSONExportRenderer(), NDJSONExportRenderer()]
+        return renderers
+
+    def get_object(self):
+        if self.action not in self.cached_object_actions:
+            return super().get_object()
+        mission = mission_cache.get(self.kwargs[self.lookup_url_kwarg or self.lookup_field])
+        self.check_object_permissions(self.request, mission)
+        return mission
+
+    def get_serializer_context(self):
+        # Lists draw small outlines; a single mission gets its full drawing
+        context = super().get_serializer_context()
+        context['geometry_detail'] = geometry_detail(self.request.query_params, 'low' if self.action == 'list' else 'full')
+        return context
+
+    def list(self, request, *args, **kwargs):
+        # Same payload as the serializer path, without per-row field dispatch
+        detail = geometry_detail(request.query_params, 'low')
+        values = mission_values(self.filter_queryset(self.get_queryset()), detail)
+        page = self.paginate_queryset(values)
+        if page is not None:
+            return self.get_paginated_response(mission_rows(page))
+        return Response(mission_rows(values))
 
     @action(detail=True, methods=['get'])
+    @conditional_response('mission:{pk}')
     def statistics(self, request, pk=None):
         mission = self.get_object()
-        sightings = mission.sightings.all()
-        
-        total_sightings = sightings.count()
-        sterilized_count = sightings.filter(sterilized=True).count()
+        total_sightings, sterilized_count = mission.sighting_counts()
         completion_percentage = (sterilized_count / total_sightings * 100) if total_sightings > 0 else 0
         
         stats = {
@@ -113,60 +1692,125 @@ class MissionViewSet(viewsets.ModelViewSet):
         serializer = MissionStatisticsSerializer(stats)
         return Response(serializer.data)
 
+    @action(detail=True, methods=['get'])
+    @conditional_response('mission:{pk}', per_minute=True)
+    def trends(self, request, pk=None):
+        """Sightings inside the mission area per hour, day or week, by status or species"""
+        mission = self.get_object()
+        sightings = mission.sightings.filter(inside_mission_area=True)
+        groups = {name: SIGHTING_TREND_GROUPS[name] for name in ('status', 'species')}
+        return Response(trend_series(sightings, 'created_at', request.query_params, groups, 'status'))
+
     @action(detail=True, methods=['get'])
     def sightings(self, request, pk=None):
         mission = self.get_object()
-        sightings = mission.sightings.all()
-        
-        # If mission has a polygon, filter sightings within it
-        if mission.polygon:
-            sightings = sightings.filter(location__within=mission.polygon)
+        # Membership is precomputed, so this is an indexed equality, not ST_Within
+        sightings = mission.sightings.filter(inside_mission_area=True)
         
         serializer = SightingSerializer(sightings, many=True)
         return Response(serializer.data)
 
+    def export_sightings(self, request, pk=None, export_format=None):
+        """Stream the mission's sightings as a GeoJSON FeatureCollection or NDJSON features"""
+        mission = self.get_object()
+        rows = mission.sightings.filter(inside_mission_area=True).annotate(geometry=AsGeoJSON('location')).values_list(
+            'id', 'name', 'sterilized', 'created_at', 'geometry'
+        ).order_by('id').iterator(chunk_size=EXPORT_CHUNK_SIZE)
+
+        def features():
+            for sighting_id, name, sterilized, created_at, geometry in rows:
+                properties = json.dumps({
+                    'id': sighting_id,
+                    'name': name,
+                    'sterilized': sterilized,
+                    'created_at': created_at.isoformat()
+                })
+                yield f'{{"type": "Feature", "geometry": {geometry}, "properties": {properties}}}'
+
+        def geojson():
+            yield '{"type": "FeatureCollection", "features": ['
+            for index, feature in enumerate(features()):
+                yield feature if index == 0 else ',\n' + feature
+            yield ']}\n'
+
+        def ndjson():
+            for feature in features():
+                yield feature + '\n'
+
+        stream = geojson() if export_format == 'geojson' else ndjson()
+        response = StreamingHttpResponse(stream, content_type=EXPORT_CONTENT_TYPES[export_format])
+        response['Content-Disposition'] = f'attachment; filename="mission-{mission.id}-sightings.{export_format}"'
+        return response
+
     @action(detail=True, methods=['get'])
+    @conditional_response('mission:{pk}')
     def dashboard(self, request, pk=None):
-        """Return dashboard data similar to drive dashboard"""
+        """Return dashboard data similar to drive dashboard; ?since=<cursor> returns only the changes"""
         mission = self.get_object()
-        sightings = mission.sightings.all()
-        
-        # Mission details
-        mission_data = MissionSerializer(mission).data
-        
+        sightings = mission.sightings.filter(inside_mission_area=True)
+        # Taken before querying so nothing written during the request is skipped
+        cursor = timezone.now()
+
+        since = request.query_params.get('since', None)
+        if since:
+            # An unencoded "+00:00" offset arrives as " 00:00"
+            since = parse_datetime(since.replace(' ', '+'))
+            if since is None or timezone.is_naive(since):
+                return Response(
+                    {'error': 'Invalid since cursor'},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+
         # KPIs
-        total_sightings = sightings.count()
-        sterilized_count = sightings.filter(sterilized=True).count()
+        total_sightings, sterilized_count = mission.sighting_counts()
         
         kpis = {
             'animals_covered': total_sightings,
             'tagged_sterilized': sterilized_count,
             'area_coverage_km2': mission.area_coverage_km2,
         }
-        
-        # GeoJSON for sightings
-        features = []
-        for sighting in sightings:
-            features.append({
-                'type': 'Feature',
-                'geometry': {
-                    'type': 'Point',
-                    'coordinates': sighting.coordinates
+
+        # Cursors older than the tombstone window could miss deletions, so
+        # those clients fall through to a full snapshot.
+        if since and since > cursor - TOMBSTONE_RETENTION:
+            changed = mission.sightings.filter(updated_at__gt=since - DELTA_CURSOR_OVERLAP)
+            deleted = list(SightingTombstone.objects.filter(
+                mission_id=mission.id,
+                deleted_at__gt=since - DELTA_CURSOR_OVERLAP
+            ).values_list('sighting_id', flat=True))
+            features = []
+            for sighting in changed:
+                # Sightings that left the mission area are removed like deletions
+                if sighting.inside_mission_area:
+                    features.append(sighting_feature(sighting))
+                else:
+                    deleted.append(sighting.id)
+
+            return Response({
+                # Unchanged polls echo their cursor, so the next one repeats this
+                # request and gets a 304
+                'cursor': format_cursor(cursor if features or deleted else since),
+                'full': False,
+                'kpis': kpis,
+                'changed': {
+                    'type': 'FeatureCollection',
+                    'features': features
                 },
-                'properties': {
-                    'id': sighting.id,
-                    'name': sighting.name,
-                    'sterilized': sighting.sterilized,
-                    'created_at': sighting.created_at.isoformat()
-                }
+                'deleted': deleted,
             })
         
+        # Mission details
+        mission_data = MissionSerializer(mission, context=self.get_serializer_context()).data
+        
+        # GeoJSON for sightings
         geo_json = {
             'type': 'FeatureCollection',
-            'features': features
+            'features': [sighting_feature(sighting) for sighting in sightings]
         }
         
         return Response({
+            'cursor': format_cursor(cursor),
+            'full': True,
             'mission_details': mission_data,
             'kpis': kpis,
             'geo_json': geo_json,
@@ -176,41 +1820,1049 @@ class MissionViewSet(viewsets.ModelViewSet):
 class SightingViewSet(viewsets.ModelViewSet):
     queryset = Sighting.objects.all().order_by('-created_at')
     serializer_class = SightingSerializer
+    pagination_class = SightingCursorPagination
+    query_budgets = {'list': 3, 'trends': 3}
+    replica_actions = {'list', 'retrieve', 'trends'}
+
+    def get_queryset(self):
+        # bbox, from, to, status, species, drive_id and q from the home map
+        return SightingFilter.from_params(self.request.query_params).apply(Sighting.objects.all())
+
+    @action(detail=False, methods=['get'])
+    def trends(self, request):
+        """Sightings per hour, day or week by status, species or mission, honoring the list filters"""
+        return Response(trend_series(
+            self.get_queryset(), 'created_at', request.query_params, SIGHTING_TREND_GROUPS, 'status'
+        ))
+
+    @action(detail=False, methods=['post'])
+    def bulk(self, request):
+        """Create up to MAX_BULK_SIGHTINGS sightings in one request, with a result per item"""
+        items = request.data
+        if not isinstance(items, list) or len(items) > MAX_BULK_SIGHTINGS:
+            return Response(
+                {'error': f'Expected a list of at most {MAX_BULK_SIGHTINGS} sightings'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        user = request.user if request.user.is_authenticated else None
+        started = time.perf_counter()
+        try:
+            results = ingest_sightings(items, user)
+        except IntegrityError:
+            # A concurrent retry stored some of the same keys first; running
+            # again reports those items as duplicates
+            try:
+                results = ingest_sightings(items, user)
+            except IntegrityError:
+                return Response(
+                    {'error': 'Conflicting upload in progress, retry later'},
+                    status=status.HTTP_409_CONFLICT
+                )
+        elapsed = time.perf_counter() - started
+
+        summary = {
+            result_status: sum(1 for result in results if result['status'] == result_status)
+            for result_status in ('created', 'duplicate', 'invalid')
+        }
+        summary['rows_per_second'] = round(len(items) / elapsed) if elapsed else None
+        logger.info('Bulk sighting ingest: %s rows in %.3fs (%s rows/s)', len(items), elapsed, summary['rows_per_second'])
+
+        return Response({'summary': summary, 'results': results})
 
     def perform_create(self, serializer):
-        # Ensure location is within mission polygon if specified
-        mission = serializer.validated_data['mission']
-        location = serializer.validated_data['location']
-        
-        if mission.polygon and not mission.polygon.contains(location):
-            # Optionally, you can raise a validation error
-            # raise serializers.ValidationError("Sighting location must be within mission area")
-            pass
-        
-        serializer.save()
+        # Sighting.save records whether the location is within the mission
+        # polygon (inside_mission_area); sightings outside it are still stored.
+        # To reject them instead:
+        # mission = serializer.validated_data['mission']
+        # if not mission.contains_point(serializer.validated_data['location']):
+        #     raise serializers.ValidationError("Sighting location must be within mission area")
+        serializer.save(user=self.request.user if self.request.user.is_authenticated else None)
+
+@api_view(['GET'])
+def vector_tile(request, layer, z, x, y):
+    """Mapbox Vector Tile of sightings or emergencies, honoring the map filters"""
+    if layer not in TILE_LAYERS or z > MAX_TILE_ZOOM or not (0 <= x < 2 ** z and 0 <= y < 2 ** z):
+        return Response({'error': 'Tile not found'}, status=status.HTTP_404_NOT_FOUND)
+
+    key = tile_cache.key(layer, z, x, y, request.query_params)
+    data = tile_cache.get(key)
+    if data is None:
+        data = TILE_LAYERS[layer](request.query_params, z, x, y)
+        tile_cache.set(key, data)
+
+    return HttpResponse(data, content_type='application/vnd.mapbox-vector-tile')
+
+@api_view(['GET'])
+def statistics_overview(request):
+    """Sighting totals and heatmap hotspots for the home map's bbox and time window"""
+    sighting_filter = SightingFilter.from_params(request.query_params)
+    return Response(hotspot_overview(sighting_filter, zoom_param(request.query_params)))
+
+@query_budget(6)
+@api_view(['GET'])
+def map_snapshot_view(request):
+    """Everything the home map shows, in one request (replaces four parallel fetches)"""
+    sighting_filter = SightingFilter.from_params(request.query_params)
+    severities = [value for value in request.query_params.get('severity', '').split(',') if value]
+    detail = geometry_detail(request.query_params, 'low')
+    return Response(map_snapshot(sighting_filter, severities, zoom_param(request.query_params), detail))
+
+@api_view(['GET'])
+@permission_classes([permissions.IsAdminUser])
+def query_metrics(request):
+    """Per view/action query counts and timings recorded by this worker"""
+    return Response(endpoint_metrics.snapshot())
+
+@api_view(['GET'])
+@permission_classes([permissions.IsAdminUser])
+def cache_metrics(request):
+    """Size and hit/miss counts of this worker's in-process caches"""
+    return Response({'missions': mission_cache.stats()})
 
 # urls.py
-from django.urls import path, include
+from django.urls import path, include, re_path
 from rest_framework.routers import DefaultRouter
-from .views import MissionViewSet, SightingViewSet
+from .views import (
+    MissionViewSet, SightingViewSet, cache_metrics, map_snapshot_view, query_metrics, statistics_overview, vector_tile
+)
 
 router = DefaultRouter()
 router.register(r'missions', MissionViewSet)
 router.register(r'sightings', SightingViewSet)
 
 urlpatterns = [
+    # Before the router, whose format-suffix routes would claim "sightings.<ext>"
+    re_path(
+        r'^api/missions/(?P<pk>[^/.]+)/sightings\.(?P<export_format>geojson|ndjson)$',
+        MissionViewSet.as_view({'get': 'export_sightings'}),
+        name='mission-sightings-export'
+    ),
+    path('api/tiles/<str:layer>/<int:z>/<int:x>/<int:y>.mvt', vector_tile, name='vector-tile'),
+    path('api/statistics/overview/', statistics_overview, name='statistics-overview'),
+    path('api/map/snapshot/', map_snapshot_view, name='map-snapshot'),
+    path('api/metrics/queries/', query_metrics, name='query-metrics'),
+    path('api/metrics/caches/', cache_metrics, name='cache-metrics'),
     path('api/', include(router.urls)),
 ]
 
 # Example API Endpoints:
-# GET /api/missions/ - List all missions
+# GET /api/missions/ - List all missions (simplified polygons; geometry_detail=low|medium|full, default low)
 # POST /api/missions/ - Create new mission
-# GET /api/missions/{id}/ - Get mission details
+# GET /api/missions/{id}/ - Get mission details (full polygon unless geometry_detail is given)
 # GET /api/missions/{id}/statistics/ - Get mission statistics
 # GET /api/missions/{id}/sightings/ - Get sightings for mission
+# GET /api/missions/{id}/sightings.geojson - Stream sightings as a GeoJSON FeatureCollection
+# GET /api/missions/{id}/sightings.ndjson - Stream sightings as newline-delimited GeoJSON features
 # GET /api/missions/{id}/dashboard/ - Get mission dashboard data
-# GET /api/sightings/ - List all sightings
+# GET /api/missions/{id}/dashboard/?since={cursor} - Get sightings changed/deleted since cursor
+# GET /api/missions/{id}/trends/?bucket=day&group_by=status&from=&to= - Sightings per time bucket
+# GET /api/sightings/ - List sightings (filters: bbox, from, to, status, species, drive_id, q;
+#                       cursor-paginated, page size via limit up to 1000)
+# GET /api/sightings/trends/?bucket=hour|day|week&group_by=status|species|mission - Sighting counts
+#                       per time bucket, with the list filters
+# GET /api/statistics/overview/ - Sighting totals and heatmap hotspots for bbox/from/to
+# GET /api/map/snapshot/ - Home map sightings, active drives, open emergencies and statistics in one
+#                       response (sighting filters plus severity, zoom and geometry_detail)
+# GET /api/metrics/queries/ - Per-endpoint query counts and timings (admin only)
+# GET /api/metrics/caches/ - Mission cache size, hits and misses for this worker (admin only)
+# GET /api/tiles/{sightings|emergencies}/{z}/{x}/{y}.mvt - Vector tile for the map layers
 # POST /api/sightings/ - Create new sighting
+# POST /api/sightings/bulk/ - Create many sightings, idempotent per user and idempotency_key
+
+# Tombstone cleanup (management command)
+# Create this as: management/commands/prune_sighting_tombstones.py
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from myapp.models import SightingTombstone
+from myapp.views import TOMBSTONE_RETENTION
+
+class Command(BaseCommand):
+    help = 'Delete sighting tombstones older than the delta-sync retention window'
+
+    def handle(self, *args, **options):
+        cutoff = timezone.now() - TOMBSTONE_RETENTION
+        deleted, _ = SightingTombstone.objects.filter(deleted_at__lt=cutoff).delete()
+
+        self.stdout.write(
+            self.style.SUCCESS(f'Deleted {deleted} sighting tombstones')
+        )
+
+# Rollup maintenance (management command)
+# Create this as: management/commands/rebuild_rollups.py
+import datetime
+from collections import defaultdict
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.db.models import Count, Q
+from django.db.models.functions import TruncDate
+from myapp.caching import bump_versions
+from myapp.models import (
+    ACTIVE_ASSIGNMENT_STATUSES, ArchivedEmergency, Emergency, EmergencyCounter, Mission, MissionRollup, Responder, Sighting
+)
+
+class Command(BaseCommand):
+    help = 'Rebuild the mission, emergency and responder load rollups from the raw tables, or check them with --check'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--check', action='store_true', help='Report drift without rewriting the rollups')
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            if not options['check']:
+                # Block writers (but not readers) so no signal update lands
+                # between counting and rewriting
+                with connection.cursor() as cursor:
+                    for model in (Sighting, Emergency, ArchivedEmergency, MissionRollup, EmergencyCounter, Responder):
+                        cursor.execute(f'LOCK TABLE {model._meta.db_table} IN SHARE ROW EXCLUSIVE MODE')
+
+            mission_drift = self.sync_missions(options['check'])
+            counter_drift = self.sync_emergency_counters(options['check'])
+            responder_drift = self.sync_responder_loads(options['check'])
+
+        drift = mission_drift + counter_drift + responder_drift
+        for line in drift:
+            self.stdout.write(line)
+
+        if options['check'] and drift:
+            raise CommandError(f'{len(drift)} rollup values differ from the raw tables')
+
+        self.stdout.write(
+            self.style.SUCCESS('Rollups match the raw tables' if options['check'] else 'Successfully rebuilt rollups')
+        )
+
+    def sync_missions(self, check):
+        actual = {
+            mission_id: (total, sterilized)
+            for mission_id, total, sterilized in Mission.objects.annotate(
+                total=Count('sightings', filter=Q(sightings__inside_mission_area=True)),
+                sterilized=Count('sightings', filter=Q(sightings__inside_mission_area=True, sightings__sterilized=True)),
+            ).values_list('id', 'total', 'sterilized')
+        }
+        stored = {
+            mission_id: (total, sterilized)
+            for mission_id, total, sterilized in MissionRollup.objects.values_list(
+                'mission_id', 'total_sightings', 'sterilized_count'
+            )
+        }
+
+        drift = [
+            f'mission {mission_id}: rollup {stored.get(mission_id)} != actual {counts}'
+            for mission_id, counts in actual.items() if stored.get(mission_id) != counts
+        ]
+        if not check:
+            bump_versions(
+                f'mission:{mission_id}' for mission_id, counts in actual.items() if stored.get(mission_id) != counts
+            )
+            MissionRollup.objects.all().delete()
+            MissionRollup.objects.bulk_create([
+                MissionRollup(mission_id=mission_id, total_sightings=total, sterilized_count=sterilized)
+                for mission_id, (total, sterilized) in actual.items()
+            ], batch_size=1000)
+        return drift
+
+    def sync_emergency_counters(self, check):
+        actual = defaultdict(int)
+        # The counters cover archived history too. Merged duplicate reports
+        # are not counted (see Emergency.counter_keys).
+        for model in (Emergency, ArchivedEmergency):
+            incidents = model.objects.filter(duplicate_of__isnull=True)
+            for field in ('severity', 'status'):
+                for value, count in incidents.values_list(field).annotate(count=Count('id')).order_by():
+                    actual[f'{field}:{value}'] += count
+            resolved = incidents.filter(status='resolved', resolved_at__isnull=False).annotate(
+                day=TruncDate('resolved_at', tzinfo=datetime.timezone.utc)
+            ).values_list('day').annotate(count=Count('id')).order_by()
+            for day, count in resolved:
+                actual[f'resolved_on:{day.isoformat()}'] += count
+
+        stored = dict(EmergencyCounter.objects.exclude(count=0).values_list('key', 'count'))
+
+        drift = [
+            f'{key}: counter {stored.get(key, 0)} != actual {actual.get(key, 0)}'
+            for key in sorted(set(actual) | set(stored)) if stored.get(key, 0) != actual.get(key, 0)
+        ]
+        if not check:
+            if drift:
+                bump_versions(['emergencies'])
+            EmergencyCounter.objects.all().delete()
+            EmergencyCounter.objects.bulk_create([
+                EmergencyCounter(key=key, count=count) for key, count in actual.items()
+            ])
+        return drift
+
+    def sync_responder_loads(self, check):
+        actual = dict(
+            Emergency.objects.filter(status__in=ACTIVE_ASSIGNMENT_STATUSES, assigned_to__isnull=False)
+            .values_list('assigned_to_id').annotate(count=Count('id')).order_by()
+        )
+        drift = []
+        for responder_id, user_id, stored in Responder.objects.values_list('id', 'user_id', 'active_assignments'):
+            if stored != actual.get(user_id, 0):
+                drift.append(f'responder {responder_id}: active_assignments {stored} != actual {actual.get(user_id, 0)}')
+                if not check:
+                    Responder.objects.filter(id=responder_id).update(active_assignments=actual.get(user_id, 0))
+        return drift
+
+# Mission geometry backfill (management command)
+# Create this as: management/commands/backfill_mission_geometry.py
+from django.contrib.gis.db.models import FloatField, PolygonField
+from django.core.management.base import BaseCommand
+from django.db.models import Func, Value
+from myapp.caching import bump_versions, mission_row_resource
+from myapp.models import MISSION_POLYGON_FIELDS, POLYGON_SIMPLIFY_TOLERANCES, Mission
+
+class GeographyArea(Func):
+    function = 'ST_Area'
+    template = '%(function)s(%(expressions)s::geography)'
+    output_field = FloatField()
+
+class Command(BaseCommand):
+    help = 'Store geodesic area, bounding box and simplified polygons for missions saved before they were persisted'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=500)
+
+    def handle(self, *args, **options):
+        ids = list(Mission.objects.filter(polygon__isnull=False).values_list('id', flat=True).order_by('id'))
+        batch_size = options['batch_size']
+
+        # Computed set-based in PostGIS; saving each Mission would also bump updated_at
+        for start in range(0, len(ids), batch_size):
+            Mission.objects.filter(id__in=ids[start:start + batch_size]).update(
+                area_km2=GeographyArea('polygon') / 1000000,
+                bbox_west=Func('polygon', function='ST_XMin', output_field=FloatField()),
+                bbox_south=Func('polygon', function='ST_YMin', output_field=FloatField()),
+                bbox_east=Func('polygon', function='ST_XMax', output_field=FloatField()),
+                bbox_north=Func('polygon', function='ST_YMax', output_field=FloatField()),
+                **{
+                    MISSION_POLYGON_FIELDS[detail]: Func(
+                        'polygon', Value(tolerance), function='ST_SimplifyPreserveTopology', output_field=PolygonField()
+                    )
+                    for detail, tolerance in POLYGON_SIMPLIFY_TOLERANCES.items()
+                },
+            )
+        # update() sends no signals; cached missions in every worker must reload
+        bump_versions(mission_row_resource(mission_id) for mission_id in ids)
+
+        self.stdout.write(
+            self.style.SUCCESS(f'Backfilled area, bounding box and simplified polygons for {len(ids)} missions')
+        )
+
+# Heatmap precomputation (management command, run daily after midnight UTC)
+# Create this as: management/commands/rebuild_hotspots.py
+import datetime
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+from myapp.aggregates import PRECOMPUTED_PRECISIONS, geohash_center, grouped_cells
+from myapp.models import HotspotCell, HotspotDay, Sighting
+
+class Command(BaseCommand):
+    help = 'Precompute per-day geohash sighting counts for the coarse heatmap zoom levels'
+
+    def add_arguments(self, parser):
+        # Run once with --days covering the history (e.g. 365) after deploying; days
+        # never rebuilt stay correct but are aggregated from raw rows
+        parser.add_argument('--days', type=int, default=1, help='Completed days to rebuild, ending yesterday (UTC)')
+        parser.add_argument('--repair-days', type=int, default=30,
+                            help='Also rebuild days this far back whose cells were dropped by later sighting edits')
+
+    def handle(self, *args, **options):
+        today = timezone.now().replace(hour=0, minute=0, second=0, microsecond=0)
+        repair_start = (today - datetime.timedelta(days=options['repair_days'])).date()
+        built = set(HotspotDay.objects.filter(day__gte=repair_start).values_list('day', flat=True))
+        offsets = set(range(1, options['days'] + 1)) | {
+            offset for offset in range(1, options['repair_days'] + 1)
+            if (today - datetime.timedelta(days=offset)).date() not in built
+        }
+
+        for offset in sorted(offsets, reverse=True):
+            start = today - datetime.timedelta(days=offset)
+            sightings = Sighting.objects.filter(created_at__gte=start, created_at__lt=start + datetime.timedelta(days=1))
+
+            with transaction.atomic():
+                HotspotCell.objects.filter(day=start.date()).delete()
+                for precision in PRECOMPUTED_PRECISIONS:
+                    HotspotCell.objects.bulk_create([
+                        HotspotCell(
+                            day=start.date(), precision=precision, cell=cell,
+                            lat=geohash_center(cell)[0], lng=geohash_center(cell)[1],
+                            count=count, sterilized_count=sterilized
+                        )
+                        for cell, count, sterilized in grouped_cells(sightings, precision)
+                    ], batch_size=1000)
+                HotspotDay.objects.update_or_create(day=start.date())
+
+            self.stdout.write(f'Rebuilt hotspots for {start.date()}')
+
+        self.stdout.write(self.style.SUCCESS('Successfully rebuilt hotspots'))
+
+# Mission membership refresh (management command; run from cron or with --loop as a worker)
+# Create this as: management/commands/refresh_mission_membership.py
+import time
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.db.models import Count, F, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+from myapp.caching import bump_versions
+from myapp.models import Mission, MissionRollup, Sighting
+from myapp.tiles import invalidate_tiles
+
+class Command(BaseCommand):
+    help = 'Recompute Sighting.inside_mission_area for missions whose polygon changed'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--chunk-size', type=int, default=5000)
+        parser.add_argument('--loop', action='store_true', help='Keep polling for edited missions')
+        parser.add_argument('--interval', type=float, default=10, help='Seconds between polls with --loop')
+        # Sightings stored before inside_mission_area existed default to inside,
+        # and their missions' versions already match; run once with --all after upgrading
+        parser.add_argument('--all', action='store_true', help='Check every mission with a polygon, once')
+
+    def handle(self, *args, **options):
+        if options['all']:
+            for mission in Mission.objects.filter(polygon__isnull=False).order_by('id'):
+                self.refresh(mission, options['chunk_size'])
+        while True:
+            for mission in Mission.objects.exclude(membership_version=F('polygon_version')):
+                self.refresh(mission, options['chunk_size'])
+            if not options['loop']:
+                break
+            time.sleep(options['interval'])
+
+    def refresh(self, mission, chunk_size):
+        version = mission.polygon_version
+        sighting_table = Sighting._meta.db_table
+        mission_table = Mission._meta.db_table
+        last_id = 0
+        changed = 0
+
+        # Short id-range chunks keep row locks brief while sightings keep arriving.
+        # updated_at moves only for flipped rows, so delta dashboards pick them up.
+        with connection.cursor() as cursor:
+            while True:
+                cursor.execute(f"""
+                    SELECT max(id) FROM (
+                        SELECT id FROM {sighting_table} WHERE mission_id = %s AND id > %s ORDER BY id LIMIT %s
+                    ) AS chunk
+                """, [mission.id, last_id, chunk_size])
+                chunk_end = cursor.fetchone()[0]
+                if chunk_end is None:
+                    break
+                cursor.execute(f"""
+                    UPDATE {sighting_table} AS s
+                    SET inside_mission_area = NOT s.inside_mission_area, updated_at = now()
+                    FROM {mission_table} AS m
+                    WHERE m.id = s.mission_id AND s.mission_id = %s AND s.id > %s AND s.id <= %s
+                      AND s.inside_mission_area IS DISTINCT FROM (m.polygon IS NULL OR ST_Within(s.location, m.polygon))
+                    RETURNING ST_X(s.location), ST_Y(s.location)
+                """, [mission.id, last_id, chunk_end])
+                flipped = cursor.fetchall()
+                invalidate_tiles('sightings', set(flipped))
+                changed += len(flipped)
+                last_id = chunk_end
+
+        # Membership changed underneath the rollup, so recount it in one statement
+        inside = Sighting.objects.filter(mission_id=OuterRef('mission_id'), inside_mission_area=True)
+        MissionRollup.objects.filter(mission_id=mission.id).update(
+            total_sightings=Coalesce(Subquery(
+                inside.values('mission_id').annotate(n=Count('id')).values('n')[:1]
+            ), 0),
+            sterilized_count=Coalesce(Subquery(
+                inside.filter(sterilized=True).values('mission_id').annotate(n=Count('id')).values('n')[:1]
+            ), 0),
+        )
+        Mission.objects.filter(id=mission.id).update(membership_version=version)
+        bump_versions([f'mission:{mission.id}'])
+
+        self.stdout.write(f'Mission {mission.id}: {changed} sightings changed membership')
+
+# Load-test data (management command; local PostGIS only)
+# Create this as: management/commands/seed_load_data.py
+import math
+import random
+from django.contrib.auth.models import User
+from django.contrib.gis.geos import Polygon
+from django.core.management import call_command
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.utils import timezone
+from myapp.models import (
+    ArchivedEmergency, Emergency, HotspotCell, HotspotDay, Mission, MissionRollup, Sighting, SightingTombstone,
+    WatchAlert,
+)
+
+LOAD_TEST_USERNAME = 'loadtest'
+LOAD_TEST_PREFIX = 'Load test'
+
+# Sightings and emergencies cluster around these (lat, lng) city centres
+LOAD_TEST_CITIES = [
+    (19.0760, 72.8777), (28.6139, 77.2090), (12.9716, 77.5946), (13.0827, 80.2707),
+    (22.5726, 88.3639), (17.3850, 78.4867), (18.5204, 73.8567), (23.0225, 72.5714),
+    (26.9124, 75.7873), (21.1458, 79.0882),
+]
+
+class Command(BaseCommand):
+    help = 'Bulk-insert synthetic missions, sightings and emergencies at production scale'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--missions', type=int, default=1000)
+        parser.add_argument('--sightings', type=int, default=2000000)
+        parser.add_argument('--emergencies', type=int, default=1000000)
+        parser.add_argument('--days', type=int, default=365, help='History to spread rows over')
+        parser.add_argument('--chunk-size', type=int, default=100000, help='Rows per INSERT ... SELECT')
+        parser.add_argument('--seed', type=int, default=None, help='Seed for reproducible mission layouts')
+        parser.add_argument('--clear', action='store_true', help='Delete previously seeded rows first')
+
+    def handle(self, *args, **options):
+        rng = random.Random(options['seed'])
+        if options['seed'] is not None:
+            with connection.cursor() as cursor:
+                cursor.execute('SELECT setseed(%s)', [rng.random() * 2 - 1])
+
+        reporter, _ = User.objects.get_or_create(username=LOAD_TEST_USERNAME)
+        if options['clear']:
+            self.clear(reporter)
+
+        mission_ids = self.seed_missions(rng, options['missions'], options['days'])
+        self.stdout.write(f'Created {len(mission_ids)} missions')
+        self.seed_sightings(mission_ids, options['sightings'], options['days'], options['chunk_size'])
+        self.seed_emergencies(reporter, options['emergencies'], options['days'], options['chunk_size'])
+
+        # Bulk inserts skip save() and the signals, so derive the rest set-based
+        call_command('backfill_mission_geometry', stdout=self.stdout)
+        call_command('rebuild_rollups', stdout=self.stdout)
+        call_command('rebuild_hotspots', days=options['days'], stdout=self.stdout)
+        with connection.cursor() as cursor:
+            for model in (Mission, Sighting, Emergency):
+                cursor.execute(f'ANALYZE {model._meta.db_table}')
+
+        self.stdout.write(self.style.SUCCESS(
+            'Seeded load-test data; restart running servers so their tile caches start empty'
+        ))
+
+    def clear(self, reporter):
+        mission_ids = list(Mission.objects.filter(title__startswith=LOAD_TEST_PREFIX).values_list('id', flat=True))
+        # Raw deletes: the ORM would load every row to send post_delete
+        with transaction.atomic(), connection.cursor() as cursor:
+            # Days holding seeded sightings fall back to raw rows until rebuild_hotspots runs
+            cursor.execute(f"""
+                SELECT DISTINCT (created_at AT TIME ZONE 'UTC')::date FROM {Sighting._meta.db_table}
+                WHERE mission_id = ANY(%s)
+            """, [mission_ids])
+            days = [row[0] for row in cursor.fetchall()]
+            for model in (HotspotCell, HotspotDay):
+                cursor.execute(f'DELETE FROM {model._meta.db_table} WHERE day = ANY(%s)', [days])
+            cursor.execute(f'DELETE FROM {Sighting._meta.db_table} WHERE mission_id = ANY(%s)', [mission_ids])
+            for model in (SightingTombstone, MissionRollup):
+                cursor.execute(f'DELETE FROM {model._meta.db_table} WHERE mission_id = ANY(%s)', [mission_ids])
+            cursor.execute(f'DELETE FROM {Mission._meta.db_table} WHERE id = ANY(%s)', [mission_ids])
+            cursor.execute(f"""
+                DELETE FROM {WatchAlert._meta.db_table} WHERE emergency_id IN (
+                    SELECT id FROM {Emergency._meta.db_table} WHERE reporter_id = %s
+                )
+            """, [reporter.id])
+            for model in (Emergency, ArchivedEmergency):
+                cursor.execute(f'DELETE FROM {model._meta.db_table} WHERE reporter_id = %s', [reporter.id])
+        self.stdout.write(
+            f'Deleted {len(mission_ids)} seeded missions and their sightings, seeded emergencies (live and '
+            f'archived) and the hotspot cells of {len(days)} days'
+        )
+
+    def seed_missions(self, rng, count, days):
+        today = timezone.now().date()
+        missions = []
+        for index in range(count):
+            city_lat, city_lng = rng.choice(LOAD_TEST_CITIES)
+            lat = city_lat + rng.gauss(0, 0.08)
+            lng = city_lng + rng.gauss(0, 0.08)
+            # Irregular 12-gon a few km across
+            radius_km = rng.uniform(0.5, 3)
+            ring = []
+            for step in range(12):
+                angle = 2 * math.pi * step / 12
+                r = radius_km * rng.uniform(0.7, 1.0)
+                ring.append((
+                    lng + r * math.cos(angle) / (111.32 * math.cos(math.radians(lat))),
+                    lat + r * math.sin(angle) / 110.57,
+                ))
+            ring.append(ring[0])
+            missions.append(Mission(
+                title=f'{LOAD_TEST_PREFIX} mission {index}',
+                city='Load test',
+                area=f'Zone {index % 50}',
+                date=today - timezone.timedelta(days=rng.randrange(days)),
+                center_lat=lat,
+                center_lon=lng,
+                polygon=Polygon(ring, srid=4326),
+            ))
+        return [mission.id for mission in Mission.objects.bulk_create(missions, batch_size=1000)]
+
+    def seed_sightings(self, mission_ids, count, days, chunk_size):
+        table = Sighting._meta.db_table
+        mission_table = Mission._meta.db_table
+        for start in range(0, count, chunk_size):
+            end = min(count, start + chunk_size)
+            # Missions drawn with a power-law skew; points normally distributed
+            # around the mission centre, so some fall outside the polygon.
+            # Times skew recent and peak mid-morning.
+            with transaction.atomic(), connection.cursor() as cursor:
+                cursor.execute(f"""
+                    WITH missions AS (
+                        SELECT id, center_lat, center_lon, polygon, row_number() OVER (ORDER BY id) AS n
+                        FROM {mission_table} WHERE id = ANY(%(ids)s)
+                    ), draws AS (
+                        SELECT i, 1 + floor(power(random(), 3) * %(missions)s)::int AS n,
+                               sqrt(-2 * ln(1 - random())) AS radius, 2 * pi() * random() AS angle,
+                               floor(%(days)s * power(random(), 2))::int AS day,
+                               greatest(0, least(23.99, 10 + 3 * sqrt(-2 * ln(1 - random())) * cos(2 * pi() * random()))) AS hour,
+                               random() AS kind, random() AS sterilized_draw
+                        FROM generate_series(%(start)s, %(end)s - 1) AS i
+                    ), points AS (
+                        SELECT d.*, m.id AS mission_id, m.polygon,
+                               ST_SetSRID(ST_MakePoint(
+                                   m.center_lon + d.radius * cos(d.angle) * 0.01,
+                                   m.center_lat + d.radius * sin(d.angle) * 0.01
+                               ), 4326) AS location,
+                               least(now(), date_trunc('day', now()) - d.day * interval '1 day' + d.hour * interval '1 hour') AS seen_at
+                        FROM draws d JOIN missions m ON m.n = d.n
+                    )
+                    INSERT INTO {table} (mission_id, name, species, sterilized, location, inside_mission_area,
+                                         created_at, updated_at)
+                    SELECT mission_id, 'Animal ' || i,
+                           CASE WHEN kind < 0.75 THEN 'dog' WHEN kind < 0.95 THEN 'cat' ELSE 'cattle' END,
+                           sterilized_draw < 0.4, location, ST_Within(location, polygon), seen_at, seen_at
+                    FROM points
+                """, {'ids': mission_ids, 'missions': len(mission_ids), 'days': days, 'start': start, 'end': end})
+            self.stdout.write(f'Inserted sightings {start}-{end}')
+
+    def seed_emergencies(self, reporter, count, days, chunk_size):
+        table = Emergency._meta.db_table
+        lats, lngs = zip(*LOAD_TEST_CITIES)
+        for start in range(0, count, chunk_size):
+            end = min(count, start + chunk_size)
+            # Most rows are old and closed; the open ones are recent, as in production
+            with transaction.atomic(), connection.cursor() as cursor:
+                cursor.execute(f"""
+                    WITH cities AS (
+                        SELECT lat, lng, row_number() OVER () AS n FROM unnest(%(lats)s::float8[], %(lngs)s::float8[]) AS c(lat, lng)
+                    ), draws AS (
+                        SELECT i, 1 + floor(random() * %(cities)s)::int AS n,
+                               sqrt(-2 * ln(1 - random())) AS radius, 2 * pi() * random() AS angle,
+                               %(days)s * power(random(), 3) AS age_days, random() AS severity_draw
+                        FROM generate_series(%(start)s, %(end)s - 1) AS i
+                    ), reports AS (
+                        SELECT d.*, c.lat + d.radius * sin(d.angle) * 0.08 AS lat,
+                               c.lng + d.radius * cos(d.angle) * 0.08 AS lng,
+                               now() - d.age_days * interval '1 day' AS reported_at,
+                               CASE WHEN d.age_days < 1 THEN (ARRAY['reported', 'assigned', 'in_progress'])[1 + i %% 3]
+                                    WHEN d.age_days < 7 THEN (ARRAY['in_progress', 'resolved'])[1 + i %% 2]
+                                    ELSE (ARRAY['resolved', 'closed'])[1 + i %% 2] END AS status
+                        FROM draws d JOIN cities c ON c.n = d.n
+                    )
+                    INSERT INTO {table} (title, description, lat, lng, location, severity, status, reporter_id,
+                                         created_at, updated_at, resolved_at, report_count)
+                    SELECT '{LOAD_TEST_PREFIX} emergency ' || i, '', lat, lng,
+                           ST_SetSRID(ST_MakePoint(lng, lat), 4326)::geography,
+                           CASE WHEN severity_draw < 0.4 THEN 'low' WHEN severity_draw < 0.75 THEN 'medium'
+                                WHEN severity_draw < 0.95 THEN 'high' ELSE 'critical' END,
+                           status, %(reporter)s, reported_at, reported_at,
+                           CASE WHEN status = 'resolved'
+                                THEN least(now(), reported_at + (1 + severity_draw * 47) * interval '1 hour') END,
+                           1
+                    FROM reports
+                """, {
+                    'lats': list(lats), 'lngs': list(lngs), 'cities': len(lats), 'days': days,
+                    'start': start, 'end': end, 'reporter': reporter.id,
+                })
+            self.stdout.write(f'Inserted emergencies {start}-{end}')
+
+# Endpoint benchmark (management command; run against seed_load_data output)
+# Create this as: management/commands/benchmark_endpoints.py
+import json
+import statistics
+import time
+import tracemalloc
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.cache import caches
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import Client, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from myapp.models import MissionRollup
+
+class Command(BaseCommand):
+    help = 'Time the hot API endpoints in-process and compare against a saved JSON baseline'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=30, help='Timed requests per endpoint')
+        parser.add_argument('--warmup', type=int, default=3)
+        parser.add_argument('--mission', type=int, default=None, help='Mission to benchmark (default: the busiest)')
+        parser.add_argument('--lat', type=float, default=19.0760)
+        parser.add_argument('--lng', type=float, default=72.8777)
+        parser.add_argument('--output', help='Write the results to this JSON file')
+        parser.add_argument('--compare', help='Baseline JSON to compare against')
+        parser.add_argument('--tolerance', type=float, default=0.2, help='Allowed p99 regression (0.2 = 20%%)')
+        parser.add_argument('--warm', action='store_true', help='Keep the response cache between requests')
+
+    def endpoints(self, mission_id, lat, lng):
+        return {
+            'emergencies.list.radius': f'/api/emergencies/?lat={lat}&lng={lng}&radius=10&time_range=24h',
+            'emergencies.list.critical': '/api/emergencies/?severity=critical&time_range=7d',
+            'emergencies.statistics': '/api/emergencies/statistics/',
+            'emergencies.statistics.filtered': f'/api/emergencies/statistics/?lat={lat}&lng={lng}&radius=25',
+            'missions.statistics': f'/api/missions/{mission_id}/statistics/',
+            'missions.dashboard': f'/api/missions/{mission_id}/dashboard/',
+            'missions.sightings': f'/api/missions/{mission_id}/sightings/',
+            'missions.list': '/api/missions/',
+        }
+
+    def handle(self, *args, **options):
+        mission_id = options['mission']
+        if mission_id is None:
+            mission_id = MissionRollup.objects.order_by('-total_sightings').values_list('mission_id', flat=True).first()
+            if mission_id is None:
+                raise CommandError('No missions with sightings; run seed_load_data first')
+
+        user, _ = User.objects.get_or_create(username='loadtest')
+        client = Client()
+        client.force_login(user)
+
+        results = {}
+        with override_settings(ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, 'testserver']):
+            for name, url in self.endpoints(mission_id, options['lat'], options['lng']).items():
+                results[name] = self.measure(client, url, options)
+                self.stdout.write(
+                    f"{name:32} p50 {results[name]['p50_ms']:8.2f} ms   p99 {results[name]['p99_ms']:8.2f} ms   "
+                    f"{results[name]['queries']:3} queries   peak {results[name]['peak_kb']:9.1f} KiB"
+                )
+
+        run = {'recorded_at': timezone.now().isoformat(), 'mission': mission_id, 'endpoints': results}
+        if options['output']:
+            with open(options['output'], 'w') as output:
+                json.dump(run, output, indent=2)
+            self.stdout.write(f"Wrote {options['output']}")
+        if options['compare']:
+            self.compare(run, options['compare'], options['tolerance'])
+
+    def measure(self, client, url, options):
+        def get():
+            if not options['warm']:
+                caches['responses'].clear()
+            return client.get(url)
+
+        for _ in range(options['warmup']):
+            response = get()
+            if response.status_code != 200:
+                raise CommandError(f'GET {url} returned {response.status_code}')
+
+        timings = []
+        for _ in range(options['requests']):
+            started = time.perf_counter()
+            get()
+            timings.append((time.perf_counter() - started) * 1000)
+        timings.sort()
+
+        # Counted and traced separately so neither skews the timings
+        with CaptureQueriesContext(connection) as queries:
+            get()
+        tracemalloc.start()
+        try:
+            get()
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+
+        return {
+            'url': url,
+            'p50_ms': round(statistics.median(timings), 2),
+            'p99_ms': round(timings[min(len(timings) - 1, int(len(timings) * 0.99))], 2),
+            'queries': len(queries),
+            'peak_kb': round(peak / 1024, 1),
+        }
+
+    def compare(self, run, path, tolerance):
+        with open(path) as baseline_file:
+            baseline = json.load(baseline_file)['endpoints']
+
+        regressions = []
+        for name, result in run['endpoints'].items():
+            before = baseline.get(name)
+            if before is None:
+                self.stdout.write(f'{name:32} new endpoint, no baseline')
+                continue
+            change = (result['p99_ms'] - before['p99_ms']) / before['p99_ms'] if before['p99_ms'] else 0
+            self.stdout.write(
+                f"{name:32} p99 {before['p99_ms']:8.2f} -> {result['p99_ms']:8.2f} ms ({change:+.0%})   "
+                f"queries {before['queries']} -> {result['queries']}"
+            )
+            if change > tolerance:
+                regressions.append(f'{name}: p99 {change:+.0%}')
+            if result['queries'] > before['queries']:
+                regressions.append(f"{name}: {before['queries']} -> {result['queries']} queries")
+
+        if regressions:
+            raise CommandError('Regressed against baseline: ' + '; '.join(regressions))
+        self.stdout.write(self.style.SUCCESS('No regressions against the baseline'))
+
+# List renderer parity check (management command; run after changing a serializer or its fast path)
+# Create this as: management/commands/check_list_parity.py
+import time
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
+from myapp.models import Emergency, Mission
+from myapp.renderers import FastJSONRenderer
+from myapp.serializers import (
+    EmergencySerializer, MissionSerializer, emergency_rows, emergency_values, mission_rows, mission_values
+)
+
+class Command(BaseCommand):
+    help = 'Check the fast list paths render the same bytes as their serializers, and time both'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=500, help='Newest rows per list to compare')
+
+    def handle(self, *args, **options):
+        now = timezone.now()
+        emergencies = Emergency.objects.select_related('reporter', 'assigned_to').order_by('-created_at')[:options['rows']]
+        missions = Mission.objects.order_by('-created_at')[:options['rows']]
+        lists = {
+            'emergencies': (
+                lambda: EmergencySerializer(emergencies, many=True, context={'now': now}).data,
+                lambda: emergency_rows(emergency_values(emergencies), now),
+            ),
+            'missions': (
+                lambda: MissionSerializer(missions, many=True, context={'geometry_detail': 'low'}).data,
+                lambda: mission_rows(mission_values(missions, 'low')),
+            ),
+        }
+
+        mismatched = []
+        for name, (serialized, fast) in lists.items():
+            started = time.perf_counter()
+            expected = JSONRenderer().render(serialized())
+            serializer_ms = (time.perf_counter() - started) * 1000
+            started = time.perf_counter()
+            rows = fast()
+            FastJSONRenderer().render(rows)
+            fast_ms = (time.perf_counter() - started) * 1000
+
+            self.stdout.write(
+                f'{name:12} serializer {serializer_ms:8.2f} ms   fast {fast_ms:8.2f} ms   '
+                f'({serializer_ms / fast_ms if fast_ms else 0:.1f}x, {len(expected)} bytes)'
+            )
+            # Both through JSONRenderer: orjson spells some floats differently
+            # (1e20, 0.00001), which says nothing about the rows themselves
+            rendered = JSONRenderer().render(rows)
+            if rendered != expected:
+                offset = next((i for i, (a, b) in enumerate(zip(expected, rendered)) if a != b), min(len(expected), len(rendered)))
+                self.stderr.write(f'{name}: differs at byte {offset}: {expected[offset - 80:offset + 80]!r} vs {rendered[offset - 80:offset + 80]!r}')
+                mismatched.append(name)
+
+        if mismatched:
+            raise CommandError(f"Fast list output differs from the serializer for: {', '.join(mismatched)}")
+        self.stdout.write(self.style.SUCCESS('Fast list output matches the serializers byte for byte'))
+
+# Query budget tests (N+1 guard for the polling endpoints)
+# Create this as: tests/test_query_budgets.py
+from django.contrib.auth.models import User
+from django.contrib.gis.geos import Point, Polygon
+from django.core.cache import caches
+from django.test import modify_settings
+from rest_framework.test import APITestCase
+from myapp.instrumentation import QueryBudgetTestMixin
+from myapp.models import Emergency, Mission, Sighting
+
+# Rows per endpoint, each with its own related users: a per-row query would
+# overrun every budget several times over
+SEED_ROWS = 25
+
+@modify_settings(MIDDLEWARE={'prepend': 'myapp.instrumentation.QueryInstrumentationMiddleware'})
+class QueryBudgetTests(QueryBudgetTestMixin, APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('budget-reporter', password='unused')
+        cls.mission = Mission.objects.create(
+            title='Budget drive', city='Pune', area='Kothrud', center_lat=18.5, center_lon=73.8,
+            polygon=Polygon(((73.7, 18.4), (73.9, 18.4), (73.9, 18.6), (73.7, 18.6), (73.7, 18.4)), srid=4326),
+        )
+        for n in range(SEED_ROWS):
+            Sighting.objects.create(
+                mission=cls.mission, name=f'Dog {n}', species='dog', sterilized=n % 2 == 0,
+                location=Point(73.8 + n * 0.001, 18.5, srid=4326),
+            )
+            responder = User.objects.create_user(f'budget-responder-{n}', first_name='Responder', last_name=str(n))
+            Emergency.objects.create(
+                title=f'Emergency {n}', description='Injured dog', lat=18.5 + n * 0.01, lng=73.8,
+                severity='critical' if n % 2 else 'high', status='assigned',
+                reporter=cls.user, assigned_to=responder,
+            )
+
+    def setUp(self):
+        self.client.force_login(self.user)
+        # Cached bodies would skip the queries under test
+        caches['responses'].clear()
+
+    def test_emergency_list(self):
+        response = self.assertWithinQueryBudget('/api/emergencies/')
+        self.assertGreater(len(response.data['results']), 1)
+
+    def test_active_emergencies(self):
+        response = self.assertWithinQueryBudget('/api/emergencies/active/')
+        self.assertEqual(len(response.data), SEED_ROWS)
+
+    def test_critical_emergencies(self):
+        response = self.assertWithinQueryBudget('/api/emergencies/critical/')
+        self.assertEqual(len(response.data), SEED_ROWS // 2)
+
+    def test_mission_dashboard(self):
+        response = self.assertWithinQueryBudget(f'/api/missions/{self.mission.id}/dashboard/')
+        self.assertEqual(len(response.data['geo_json']['features']), SEED_ROWS)
+
+    def test_mission_sightings(self):
+        response = self.assertWithinQueryBudget(f'/api/missions/{self.mission.id}/sightings/')
+        self.assertEqual(len(response.data), SEED_ROWS)
+
+    def test_map_snapshot(self):
+        response = self.assertWithinQueryBudget('/api/map/snapshot/')
+        self.assertEqual(len(response.data['sightings']), SEED_ROWS)
+        self.assertEqual(len(response.data['emergencies']), SEED_ROWS)
+
+# List parity tests (fast list paths against their serializers)
+# Create this as: tests/test_list_parity.py
+from unittest import mock
+from django.contrib.auth.models import User
+from django.contrib.gis.geos import Polygon
+from django.core.cache import caches
+from django.utils import timezone
+from rest_framework import viewsets
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APITestCase
+from myapp.models import Emergency, Mission
+from myapp.views import EmergencyViewSet, MissionViewSet
+
+class ListParityTests(APITestCase):
+    """Fast list responses (FastJSONRenderer) byte for byte against the serializer path (JSONRenderer)"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('parity-reporter', first_name='Asha', last_name='Rao', password='unused')
+        responder = User.objects.create_user('parity-responder', first_name='Ravi')
+        # Unassigned, without a photo
+        Emergency.objects.create(
+            title='Limping stray', description='Near the bus stop', lat=18.5204303, lng=73.8567437,
+            severity='high', reporter=cls.user,
+        )
+        Emergency.objects.create(
+            title='Injured dog', description='Caf\u00e9 corner\u2028second line', lat=19.0760898, lng=72.8774262,
+            severity='critical', status='assigned', photo_url='https://example.com/dog.jpg',
+            reporter=cls.user, assigned_to=responder,
+        )
+        Emergency.objects.create(
+            title='Rescued', description='Handed to shelter', lat=-33.8688197, lng=151.2092955,
+            severity='low', status='resolved', resolved_at=timezone.now(), reporter=cls.user,
+        )
+        Mission.objects.create(title='Undrawn drive', city='Pune', area='Baner', center_lat=18.559, center_lon=73.7868)
+        Mission.objects.create(
+            title='Drawn drive', description='Ward 12', city='Pune', area='Kothrud',
+            center_lat=18.5074157, center_lon=73.8076979,
+            polygon=Polygon(((73.79, 18.49), (73.83, 18.49), (73.83, 18.52), (73.79, 18.52), (73.79, 18.49)), srid=4326),
+        )
+
+    def setUp(self):
+        self.client.force_login(self.user)
+        caches['responses'].clear()
+
+    def assertSameListBytes(self, url, viewset):
+        fast = self.client.get(url)
+        with mock.patch.object(viewset, 'list', viewsets.ModelViewSet.list), \
+                mock.patch.object(viewset, 'renderer_classes', [JSONRenderer]):
+            serialized = self.client.get(url)
+        self.assertEqual(fast.status_code, 200)
+        self.assertEqual(fast.content, serialized.content)
+
+    def test_emergency_list(self):
+        self.assertSameListBytes('/api/emergencies/', EmergencyViewSet)
+
+    def test_mission_list(self):
+        self.assertSameListBytes('/api/missions/', MissionViewSet)
+
+# Replica routing tests (no replica database needed: they check the alias chosen)
+# Create this as: tests/test_replica_routing.py
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase, override_settings
+from myapp.models import Mission
+from myapp.replicas import ReplicaRouter, ReplicaRoutingMiddleware, primary_reads
+from myapp.views import MissionViewSet
+
+# Not a configured database, and so never mirrored: reads that reach it are
+# routed there, not answered by the primary in disguise
+REPLICA_ALIAS = 'replica-under-test'
+
+@override_settings(DATABASE_REPLICAS=[REPLICA_ALIAS])
+class ReplicaRoutingTests(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+        self.factory = RequestFactory()
+        self.router = ReplicaRouter()
+        self.middleware = ReplicaRoutingMiddleware(lambda request: HttpResponse())
+
+    def route(self, request, actions=None, model=Mission):
+        """Run request through the middleware; returns the alias model reads went to in the view"""
+        view = MissionViewSet.as_view(actions or {'get': 'list', 'post': 'create'})
+        seen = []
+
+        def get_response(request):
+            self.middleware.process_view(request, view, (), {})
+            seen.append(self.router.db_for_read(model))
+            with primary_reads():
+                seen.append(self.router.db_for_read(model))
+            return HttpResponse(status=201 if request.method == 'POST' else 200)
+
+        # The middleware resets the routing when the response is done, so
+        # nothing leaks into the next test
+        self.middleware.get_response = get_response
+        self.middleware(request)
+        self.routed_inside_primary_reads = seen[1]
+        return seen[0]
+
+    def test_replica_actions_read_from_replica(self):
+        self.assertEqual(self.route(self.factory.get('/api/missions/')), REPLICA_ALIAS)
+
+    def test_other_actions_read_from_primary(self):
+        view_actions = {'get': 'export_sightings'}
+        self.assertIsNone(self.route(self.factory.get('/api/missions/1/export_sightings/'), view_actions))
+
+    def test_auth_models_read_from_primary(self):
+        self.assertIsNone(self.route(self.factory.get('/api/missions/'), model=User))
+
+    def test_primary_reads_overrides_replica(self):
+        self.assertEqual(self.route(self.factory.get('/api/missions/')), REPLICA_ALIAS)
+        self.assertIsNone(self.routed_inside_primary_reads)
+        self.assertIsNone(self.router.db_for_read(Mission))
+
+    def test_write_pins_client(self):
+        self.route(self.factory.post('/api/missions/', HTTP_AUTHORIZATION='Token writer'))
+        self.assertIsNone(self.route(self.factory.get('/api/missions/', HTTP_AUTHORIZATION='Token writer')))
+        self.assertEqual(self.route(self.factory.get('/api/missions/', HTTP_AUTHORIZATION='Token other')), REPLICA_ALIAS)
+
+    def test_login_pins_issued_session(self):
+        def login(request):
+            response = HttpResponse()
+            response.set_cookie(settings.SESSION_COOKIE_NAME, 'new-session')
+            return response
+
+        ReplicaRoutingMiddleware(login)(self.factory.post('/api-auth/login/'))
+        request = self.factory.get('/api/missions/')
+        request.COOKIES[settings.SESSION_COOKIE_NAME] = 'new-session'
+        self.assertIsNone(self.route(request))
 
 # settings.py additions:
 # INSTALLED_APPS = [
@@ -230,10 +2882,52 @@ urlpatterns = [
 #         'PASSWORD': 'your_password',
 #         'HOST': 'localhost',
 #         'PORT': '5432',
-#     }
+#         # Keep connections open between requests instead of reconnecting per request
+#         # (on Django 5.1+ 'OPTIONS': {'pool': True} pools them instead; use one or the other)
+#         'CONN_MAX_AGE': 60,
+#         'CONN_HEALTH_CHECKS': True,
+#     },
+#     # Streaming replica of default. Locally, a second database on the same
+#     # server stands in for it; TEST.MIRROR makes tests read what they wrote.
+#     'replica': {
+#         'ENGINE': 'django.contrib.gis.db.backends.postgis',
+#         'NAME': 'your_database_name_replica',
+#         'USER': 'your_readonly_username',
+#         'PASSWORD': 'your_password',
+#         'HOST': 'localhost',
+#         'PORT': '5432',
+#         'CONN_MAX_AGE': 60,
+#         'CONN_HEALTH_CHECKS': True,
+#         'TEST': {'MIRROR': 'default'},
+#     },
 # }
 #
+# DATABASE_ROUTERS = ['myapp.replicas.ReplicaRouter']
+# DATABASE_REPLICAS = ['replica']  # read-only GET actions listed in replica_actions
+#
+# MIDDLEWARE = [
+#     'myapp.instrumentation.QueryInstrumentationMiddleware',  # first, so it sees every query
+#     'myapp.replicas.ReplicaRoutingMiddleware',  # pins writers to the primary (see REPLICA_PIN_SECONDS)
+#     ...
+# ]
+#
 # REST_FRAMEWORK = {
 #     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
 #     'PAGE_SIZE': 20
 # }
+#
+# QUERY_BUDGET_ENFORCE = False  # True in test settings: over-budget requests raise
+#
+# CACHES = {
+#     # Shared by all workers: tile generations and response versions live here
+#     'default': {
+#         'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+#         'LOCATION': 'redis://127.0.0.1:6379',
+#     },
+#     # Per-worker response bodies for conditional GETs, keyed by ETag
+#     'responses': {
+#         'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+#         'TIMEOUT': 300,
+#         'OPTIONS': {'MAX_ENTRIES': 2000},
+#     },
+# }
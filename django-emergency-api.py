@@ -2,7 +2,13 @@
 # This code should be added to your Django backend project
 
 # models.py
-from django.db import models
+from django.contrib.gis.db import models
+from django.contrib.gis.geos import GEOSGeometry, Point
+from django.contrib.postgres.indexes import BrinIndex, GistIndex
+from django.db import connection, transaction
+from django.db.models import F
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
 from django.contrib.auth.models import User
 
 class Emergency(models.Model):
@@ -25,6 +31,8 @@ class Emergency(models.Model):
     description = models.TextField()
     lat = models.FloatField()
     lng = models.FloatField()
+    # Mirrors lat/lng (set on save) for indexed distance queries in metres
+    location = models.PointField(geography=True, null=True, blank=True)
     severity = models.CharField(max_length=10, choices=SEVERITY_CHOICES, default='medium')
     status = models.CharField(max_length=15, choices=STATUS_CHOICES, default='reported')
     photo_url = models.URLField(blank=True, null=True)
@@ -33,18 +41,237 @@ class Emergency(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     resolved_at = models.DateTimeField(null=True, blank=True)
+    # Set when this report was merged into an earlier report of the same
+    # incident (see dedup.py); lists and counts only show parent incidents
+    duplicate_of = models.ForeignKey('self', on_delete=models.SET_NULL, null=True, blank=True, related_name='duplicates')
+    report_count = models.IntegerField(default=1)
 
     class Meta:
         ordering = ['-created_at']
         verbose_name = 'Emergency'
         verbose_name_plural = 'Emergencies'
+        indexes = [
+            # Append-only in created_at order: tiny, and enough for trend ranges
+            BrinIndex(fields=['created_at'], name='emergency_created_at_brin'),
+            # Resolution trends and "resolved today" only look at resolved rows
+            models.Index(
+                fields=['resolved_at'],
+                condition=models.Q(resolved_at__isnull=False),
+                name='emergency_resolved_at'
+            ),
+        ]
 
     def __str__(self):
         return f"{self.title} - {self.severity.upper()}"
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Remember the counted fields so saves can move the rollup counters
+        if {'severity', 'status', 'resolved_at', 'duplicate_of_id'}.issubset(field_names):
+            instance._counted_keys = instance.counter_keys()
+        if {'status', 'assigned_to_id'}.issubset(field_names):
+            instance._loaded_assignee = instance.active_assignee()
+        if 'severity' in field_names:
+            instance._alerted_severity = instance.severity
+        return instance
+
+    def save(self, *args, **kwargs):
+        self.location = Point(self.lng, self.lat, srid=4326)
+        # The row and its counter updates (post_save) commit together
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+
+    def active_assignee(self):
+        """Id of the user this emergency currently occupies, if any"""
+        return self.assigned_to_id if self.status in ACTIVE_ASSIGNMENT_STATUSES else None
+
+    def counter_keys(self):
+        if self.duplicate_of_id:
+            # Statistics count incidents, not reports
+            return set()
+        keys = {f'severity:{self.severity}', f'status:{self.status}'}
+        if self.status == 'resolved' and self.resolved_at:
+            keys.add(f'resolved_on:{self.resolved_at.date().isoformat()}')
+        return keys
+
+class EmergencyCounter(models.Model):
+    """Rollup of emergency counts by severity, status and resolution day"""
+    key = models.CharField(max_length=40, unique=True)
+    count = models.BigIntegerField(default=0)
+
+    def __str__(self):
+        return f"{self.key} = {self.count}"
+
+def bump_emergency_counters(deltas):
+    for key, delta in deltas.items():
+        if delta and not EmergencyCounter.objects.filter(key=key).update(count=F('count') + delta):
+            EmergencyCounter.objects.get_or_create(key=key)
+            EmergencyCounter.objects.filter(key=key).update(count=F('count') + delta)
+
+@receiver(post_save, sender=Emergency)
+def count_saved_emergency(sender, instance, created, **kwargs):
+    old_keys = set() if created else getattr(instance, '_counted_keys', None)
+    if old_keys is None:
+        # Saved without having been loaded from the database; rebuild_rollups
+        # repairs any drift this causes.
+        old_keys = set()
+    new_keys = instance.counter_keys()
+
+    deltas = {key: 1 for key in new_keys - old_keys}
+    deltas.update({key: -1 for key in old_keys - new_keys})
+    bump_emergency_counters(deltas)
+    instance._counted_keys = new_keys
+
+@receiver(post_delete, sender=Emergency)
+def count_deleted_emergency(sender, instance, **kwargs):
+    keys = getattr(instance, '_counted_keys', None) or instance.counter_keys()
+    bump_emergency_counters({key: -1 for key in keys})
+
+# Emergencies in these statuses count towards their assignee's load
+ACTIVE_ASSIGNMENT_STATUSES = ('assigned', 'in_progress')
+
+class Responder(models.Model):
+    """A user who can be dispatched, with their last reported position and load"""
+    user = models.OneToOneField(User, on_delete=models.CASCADE, related_name='responder')
+    location = models.PointField(geography=True, null=True, blank=True)
+    location_updated_at = models.DateTimeField(null=True, blank=True)
+    available = models.BooleanField(default=True)
+    active_assignments = models.IntegerField(default=0)
+    max_assignments = models.IntegerField(default=1)
+
+    class Meta:
+        indexes = [
+            # Dispatch only ever searches responders who are on duty
+            GistIndex(fields=['location'], condition=models.Q(available=True), name='responder_available_location_gist'),
+        ]
+
+    def __str__(self):
+        return f"{self.user.username} ({self.active_assignments}/{self.max_assignments})"
+
+def bump_responder_load(user_id, delta):
+    if user_id:
+        Responder.objects.filter(user_id=user_id).update(active_assignments=F('active_assignments') + delta)
+
+@receiver(post_save, sender=Emergency)
+def track_responder_load(sender, instance, created, **kwargs):
+    # Unknown for instances not loaded from the database; rebuild_rollups
+    # repairs any drift this causes
+    old_assignee = None if created else getattr(instance, '_loaded_assignee', None)
+    new_assignee = instance.active_assignee()
+    if old_assignee != new_assignee:
+        bump_responder_load(old_assignee, -1)
+        bump_responder_load(new_assignee, 1)
+    instance._loaded_assignee = new_assignee
+
+@receiver(post_delete, sender=Emergency)
+def release_responder_load(sender, instance, **kwargs):
+    bump_responder_load(getattr(instance, '_loaded_assignee', None), -1)
+
+SEVERITY_RANK = {severity: rank for rank, (severity, _) in enumerate(Emergency.SEVERITY_CHOICES)}
+
+class WatchArea(models.Model):
+    """A user's subscription to emergencies inside a polygon or radius circle"""
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='watch_areas')
+    name = models.CharField(max_length=100)
+    area = models.PolygonField(spatial_index=False)
+    center = models.PointField(null=True, blank=True)
+    radius_m = models.FloatField(null=True, blank=True)
+    min_severity = models.CharField(max_length=10, choices=Emergency.SEVERITY_CHOICES, default='high')
+    # SEVERITY_RANK of min_severity, so the matcher compares integers
+    min_severity_rank = models.SmallIntegerField(default=0)
+    active = models.BooleanField(default=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [
+            GistIndex(fields=['area'], condition=models.Q(active=True), name='watch_area_active_area_gist'),
+        ]
+
+    def __str__(self):
+        return f"{self.name} ({self.user.username})"
+
+    def save(self, *args, **kwargs):
+        if self.center is not None and self.radius_m:
+            self.area = geodesic_buffer(self.center, self.radius_m)
+        self.min_severity_rank = SEVERITY_RANK[self.min_severity]
+        super().save(*args, **kwargs)
+
+def geodesic_buffer(point, radius_m):
+    """Polygon of the points within radius_m of point on the spheroid, as computed by PostGIS"""
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT ST_AsEWKB(ST_Buffer(ST_GeomFromEWKB(%s)::geography, %s, 'quad_segs=16')::geometry)",
+            [bytes(point.ewkb), radius_m]
+        )
+        return GEOSGeometry(bytes(cursor.fetchone()[0]))
+
+class WatchAlert(models.Model):
+    """Queued notification of an emergency in a watch area; delivered by deliver_watch_alerts"""
+    watch_area = models.ForeignKey(WatchArea, on_delete=models.CASCADE, related_name='alerts')
+    emergency = models.ForeignKey(Emergency, on_delete=models.CASCADE, related_name='watch_alerts')
+    event = models.CharField(max_length=10)  # "created" or "escalated"
+    created_at = models.DateTimeField(auto_now_add=True)
+    delivered_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        unique_together = [('watch_area', 'emergency')]
+        indexes = [
+            # The delivery queue: undelivered alerts, oldest first
+            models.Index(fields=['created_at'], condition=models.Q(delivered_at__isnull=True), name='watch_alert_pending'),
+        ]
+
+class ArchivedEmergency(models.Model):
+    """Resolved and closed emergencies moved out of the live table by archive_emergencies"""
+    title = models.CharField(max_length=200)
+    description = models.TextField()
+    lat = models.FloatField()
+    lng = models.FloatField()
+    location = models.PointField(geography=True, null=True, blank=True, spatial_index=False)
+    severity = models.CharField(max_length=10, choices=Emergency.SEVERITY_CHOICES)
+    status = models.CharField(max_length=15, choices=Emergency.STATUS_CHOICES)
+    photo_url = models.URLField(blank=True, null=True)
+    reporter = models.ForeignKey(User, on_delete=models.CASCADE, related_name='+')
+    assigned_to = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True, related_name='+')
+    created_at = models.DateTimeField()
+    updated_at = models.DateTimeField()
+    resolved_at = models.DateTimeField(null=True, blank=True)
+    # A report can be archived while its parent incident is still live (or
+    # is archived with it), so this is not a foreign key
+    duplicate_of = models.IntegerField(null=True, blank=True, db_column='duplicate_of_id')
+    report_count = models.IntegerField(default=1)
+    archived_at = models.DateTimeField()
+
+    class Meta:
+        ordering = ['-created_at']
+        verbose_name = 'Archived emergency'
+        verbose_name_plural = 'Archived emergencies'
+        indexes = [
+            BrinIndex(fields=['created_at'], name='archived_emergency_created_brin'),
+        ]
+
+    def __str__(self):
+        return f"{self.title} - {self.severity.upper()} (archived)"
+
 # serializers.py
+from django.contrib.gis.geos import Point
+from django.db import transaction
+from django.utils import timezone
 from rest_framework import serializers
-from .models import Emergency
+from rest_framework_gis.fields import GeometryField
+from .models import ArchivedEmergency, Emergency, Responder, WatchArea
+from .dedup import find_duplicate_parent, lock_report_area, merge_into_parent
+
+def time_since(created_at, now):
+    """Age of a report as shown in lists: Just now, 5m ago, 3h ago or 2d ago"""
+    seconds = (now - created_at).total_seconds()
+    if seconds < 60:
+        return "Just now"
+    if seconds < 3600:
+        return f"{int(seconds // 60)}m ago"
+    if seconds < 86400:
+        return f"{int(seconds // 3600)}h ago"
+    return f"{int(seconds // 86400)}d ago"
 
 class EmergencySerializer(serializers.ModelSerializer):
     reporter_name = serializers.CharField(source='reporter.get_full_name', read_only=True)
@@ -57,23 +284,68 @@ class EmergencySerializer(serializers.ModelSerializer):
             'id', 'title', 'description', 'lat', 'lng', 
             'severity', 'status', 'photo_url', 'reporter', 
             'reporter_name', 'assigned_to', 'assigned_to_name',
-            'created_at', 'updated_at', 'resolved_at', 'time_since_created'
+            'created_at', 'updated_at', 'resolved_at', 'time_since_created',
+            'duplicate_of', 'report_count'
         ]
-        read_only_fields = ['id', 'created_at', 'updated_at', 'reporter']
+        read_only_fields = ['id', 'created_at', 'updated_at', 'reporter', 'duplicate_of', 'report_count']
 
     def get_time_since_created(self, obj):
-        from django.utils import timezone
-        now = timezone.now()
-        diff = now - obj.created_at
-        
-        if diff.seconds < 60:
-            return "Just now"
-        elif diff.seconds < 3600:
-            return f"{diff.seconds // 60}m ago"
-        elif diff.days == 0:
-            return f"{diff.seconds // 3600}h ago"
-        else:
-            return f"{diff.days}d ago"
+        # Pass 'now' in the context so every row of a response is aged from the same instant
+        return time_since(obj.created_at, self.context.get('now') or timezone.now())
+
+# Columns read by emergency_rows, in output order; names come from the user joins
+EMERGENCY_ROW_COLUMNS = (
+    'id', 'title', 'description', 'lat', 'lng', 'severity', 'status', 'photo_url',
+    'reporter_id', 'reporter__first_name', 'reporter__last_name',
+    'assigned_to_id', 'assigned_to__first_name', 'assigned_to__last_name',
+    'created_at', 'updated_at', 'resolved_at', 'duplicate_of_id', 'report_count',
+)
+
+def emergency_values(queryset):
+    """Tuples for emergency_rows; paginate these rather than the model queryset"""
+    return queryset.values_list(*EMERGENCY_ROW_COLUMNS)
+
+def full_name(first_name, last_name):
+    # User.get_full_name without the instance
+    return f"{first_name} {last_name}".strip()
+
+def emergency_rows(values, now=None):
+    """EmergencySerializer(many=True) output built straight from emergency_values() tuples"""
+    now = now or timezone.now()
+    to_datetime = serializers.DateTimeField().to_representation
+    rows = []
+    for (
+        id, title, description, lat, lng, severity, status, photo_url,
+        reporter_id, reporter_first_name, reporter_last_name,
+        assigned_to_id, assigned_to_first_name, assigned_to_last_name,
+        created_at, updated_at, resolved_at, duplicate_of_id, report_count,
+    ) in values:
+        row = {
+            'id': id, 'title': title, 'description': description, 'lat': lat, 'lng': lng,
+            'severity': severity, 'status': status, 'photo_url': photo_url,
+            'reporter': reporter_id,
+            'reporter_name': full_name(reporter_first_name, reporter_last_name),
+            'assigned_to': assigned_to_id,
+            'assigned_to_name': full_name(assigned_to_first_name, assigned_to_last_name),
+            'created_at': to_datetime(created_at),
+            'updated_at': to_datetime(updated_at),
+            'resolved_at': to_datetime(resolved_at) if resolved_at else None,
+            'time_since_created': time_since(created_at, now),
+            'duplicate_of': duplicate_of_id, 'report_count': report_count,
+        }
+        # EmergencySerializer skips a name field (SkipField) when there is no user
+        if reporter_id is None:
+            del row['reporter_name']
+        if assigned_to_id is None:
+            del row['assigned_to_name']
+        rows.append(row)
+    return rows
+
+class ArchivedEmergencySerializer(EmergencySerializer):
+    class Meta(EmergencySerializer.Meta):
+        model = ArchivedEmergency
+        fields = EmergencySerializer.Meta.fields + ['archived_at']
+        read_only_fields = fields
 
 class EmergencyCreateSerializer(serializers.ModelSerializer):
     class Meta:
@@ -83,16 +355,650 @@ class EmergencyCreateSerializer(serializers.ModelSerializer):
     def create(self, validated_data):
         # Set the reporter to the current user
         validated_data['reporter'] = self.context['request'].user
-        return super().create(validated_data)
+        lat, lng = validated_data['lat'], validated_data['lng']
+        with transaction.atomic():
+            lock_report_area(lat, lng)
+            parent = find_duplicate_parent(lat, lng)
+            emergency = super().create({**validated_data, 'duplicate_of': parent})
+            if parent is not None:
+                merge_into_parent(parent, emergency)
+        return emergency
+
+class ResponderSerializer(serializers.ModelSerializer):
+    name = serializers.CharField(source='user.get_full_name', read_only=True)
+    lat = serializers.SerializerMethodField()
+    lng = serializers.SerializerMethodField()
+
+    class Meta:
+        model = Responder
+        fields = [
+            'id', 'user', 'name', 'lat', 'lng', 'location_updated_at',
+            'available', 'active_assignments', 'max_assignments'
+        ]
+        read_only_fields = fields
+
+    def get_lat(self, obj):
+        return obj.location.y if obj.location else None
+
+    def get_lng(self, obj):
+        return obj.location.x if obj.location else None
+
+class WatchAreaSerializer(serializers.ModelSerializer):
+    """A watch area is either `area` (a GeoJSON polygon) or a circle: lat, lng and radius_m"""
+    area = GeometryField(required=False)
+    lat = serializers.FloatField(write_only=True, required=False)
+    lng = serializers.FloatField(write_only=True, required=False)
+
+    class Meta:
+        model = WatchArea
+        fields = ['id', 'name', 'area', 'lat', 'lng', 'radius_m', 'min_severity', 'active', 'created_at']
+        read_only_fields = ['id', 'created_at']
+
+    def validate(self, data):
+        lat, lng = data.pop('lat', None), data.pop('lng', None)
+        if 'area' in data:
+            if data['area'].geom_type != 'Polygon':
+                raise serializers.ValidationError({'area': 'Expected a Polygon'})
+            data['center'] = data['radius_m'] = None
+        elif lat is not None and lng is not None and data.get('radius_m'):
+            data['center'] = Point(lng, lat, srid=4326)
+        elif self.instance is None:
+            raise serializers.ValidationError('Give either area or lat, lng and radius_m')
+        return data
+
+# filters.py
+import math
+from django.contrib.gis.geos import Point
+from django.contrib.gis.measure import D
+from django.db.models import FloatField, Func
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+EARTH_RADIUS_KM = 6371.0088
+
+def haversine_km(lat1, lng1, lat2, lng2):
+    lat1, lng1, lat2, lng2 = map(math.radians, (lat1, lng1, lat2, lng2))
+    a = math.sin((lat2 - lat1) / 2) ** 2 + math.cos(lat1) * math.cos(lat2) * math.sin((lng2 - lng1) / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(math.sqrt(a))
+
+class KNNDistance(Func):
+    """`a <-> b`: ordering by it lets PostGIS walk the GiST index nearest-first"""
+    arg_joiner = ' <-> '
+    template = '(%(expressions)s)'
+    output_field = FloatField()
+
+class EmergencyFilter:
+    """Query-param filters shared by the list endpoints and the event stream"""
+
+    TIME_RANGES = {
+        '1h': timezone.timedelta(hours=1),
+        '24h': timezone.timedelta(days=1),
+        '7d': timezone.timedelta(days=7),
+    }
+
+    def __init__(self, severity=None, status=None, center=None, radius_km=None, time_range=None,
+                 include_duplicates=False):
+        self.severity = severity
+        self.status = status
+        self.center = center  # (lat, lng)
+        self.radius_km = radius_km
+        self.time_range = time_range if time_range in self.TIME_RANGES else None
+        self.include_duplicates = include_duplicates
+
+    @classmethod
+    def from_params(cls, params):
+        # Filter by location (radius search)
+        lat = params.get('lat', None)
+        lng = params.get('lng', None)
+        radius = params.get('radius', None)
+        center = radius_km = None
+
+        if lat and lng and radius:
+            center = (float(lat), float(lng))
+            radius_km = float(radius)
+
+        return cls(
+            severity=params.get('severity', None),
+            status=params.get('status', None),
+            center=center,
+            radius_km=radius_km,
+            time_range=params.get('time_range', None),
+            include_duplicates=params.get('include_duplicates', '').lower() == 'true',
+        )
+
+    def created_after(self):
+        return timezone.now() - self.TIME_RANGES[self.time_range]
+
+    def apply(self, queryset):
+        if self.severity:
+            queryset = queryset.filter(severity=self.severity)
+
+        if self.status:
+            queryset = queryset.filter(status=self.status)
+
+        if self.center:
+            # ST_DWithin on geography: exact metres, answered from the GiST index
+            lat, lng = self.center
+            queryset = queryset.filter(
+                location__dwithin=(Point(lng, lat, srid=4326), D(km=self.radius_km))
+            )
+
+        if self.time_range:
+            queryset = queryset.filter(created_at__gte=self.created_after())
+
+        if not self.include_duplicates:
+            queryset = queryset.filter(duplicate_of__isnull=True)
+
+        return queryset
+
+    def matches(self, data):
+        """Test a serialized emergency (EmergencySerializer output) in memory"""
+        if self.severity and data['severity'] != self.severity:
+            return False
+
+        if self.status and data['status'] != self.status:
+            return False
+
+        if self.center and haversine_km(*self.center, data['lat'], data['lng']) > self.radius_km:
+            return False
+
+        if self.time_range and parse_datetime(data['created_at']) < self.created_after():
+            return False
+
+        if not self.include_duplicates and data.get('duplicate_of'):
+            return False
+
+        return True
+
+# dedup.py
+import math
+from django.contrib.gis.db.models import PointField
+from django.contrib.gis.geos import Point
+from django.contrib.gis.measure import D
+from django.db import connection
+from django.db.models import Value
+from django.utils import timezone
+from .models import SEVERITY_RANK, Emergency
+from .filters import KNNDistance
+
+# Reports of an open incident this close in space and time are linked to it
+DUPLICATE_RADIUS_M = 150
+DUPLICATE_WINDOW = timezone.timedelta(minutes=30)
+
+# Advisory-lock grid in degrees; cells are wider than the radius up to ~80° latitude
+DEDUP_GRID_DEGREES = 0.01
+
+def lock_report_area(lat, lng):
+    """Serialize reports near one place until the transaction ends"""
+    lat_delta = DUPLICATE_RADIUS_M / 111320
+    lng_delta = lat_delta / max(math.cos(math.radians(lat)), 0.01)
+    cells = sorted({
+        (math.floor(cell_lat / DEDUP_GRID_DEGREES), math.floor(cell_lng / DEDUP_GRID_DEGREES))
+        for cell_lat in (lat - lat_delta, lat + lat_delta)
+        for cell_lng in (lng - lng_delta, lng + lng_delta)
+    })
+    with connection.cursor() as cursor:
+        for row, column in cells:
+            cursor.execute('SELECT pg_advisory_xact_lock(%s, %s)', [row, column])
+
+def find_duplicate_parent(lat, lng):
+    """The nearest open incident reported within the duplicate radius and window, locked"""
+    point = Point(lng, lat, srid=4326)
+    return Emergency.objects.select_for_update().exclude(
+        status__in=['resolved', 'closed']
+    ).filter(
+        duplicate_of__isnull=True,
+        created_at__gte=timezone.now() - DUPLICATE_WINDOW,
+        location__dwithin=(point, D(m=DUPLICATE_RADIUS_M)),
+    ).annotate(
+        knn=KNNDistance('location', Value(point, output_field=PointField(geography=True)))
+    ).order_by('knn').first()
+
+def merge_into_parent(parent, report):
+    """Count the report on its parent incident and raise the parent's severity to match"""
+    # The parent row is locked by find_duplicate_parent
+    parent.report_count += 1
+    parent.severity = max(parent.severity, report.severity, key=SEVERITY_RANK.get)
+    parent.save()
+
+# events.py
+import asyncio
+import itertools
+import json
+from collections import deque
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import connection, transaction
+from django.utils.module_loading import import_string
+from .models import Emergency
+from .serializers import EmergencySerializer
+
+class SubscriptionClosed(Exception):
+    pass
+
+class Subscription:
+    """One stream's view of the broker: a bounded queue of pending events"""
+
+    def __init__(self, broker, backlog, queue_size):
+        self.broker = broker
+        self.backlog = deque(backlog)
+        self.queue = asyncio.Queue(maxsize=queue_size)
+        self.overflowed = False
+
+    def deliver(self, message):
+        try:
+            self.queue.put_nowait(message)
+        except asyncio.QueueFull:
+            # A stalled client must not hold back the others. It is dropped
+            # once its queue drains and can resume with Last-Event-ID.
+            self.overflowed = True
+            self.broker.unsubscribe(self)
+
+    async def get(self, timeout):
+        """Next event, or None if nothing arrived within timeout seconds"""
+        if self.backlog:
+            return self.backlog.popleft()
+        if self.overflowed and self.queue.empty():
+            raise SubscriptionClosed()
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+    def close(self):
+        self.broker.unsubscribe(self)
+
+class InProcessBroker:
+    """Fans emergency events out to every stream connected to this process"""
+
+    def __init__(self, queue_size=100, replay_size=1000):
+        self.queue_size = queue_size
+        self.replay = deque(maxlen=replay_size)
+        self.subscribers = set()
+        self.loop = None
+        self._ids = itertools.count(1)
+
+    def publish(self, event_type, emergency):
+        """Called from sync views once the change has committed"""
+        self.dispatch(event_type, EmergencySerializer(emergency).data)
+
+    def dispatch(self, event_type, data):
+        message = self.build_message(event_type, data)
+        if self.loop is None:
+            # No stream has connected yet; keep it for Last-Event-ID replay only
+            self.replay.append(message)
+        else:
+            # Views run in worker threads, so hop onto the streams' event loop
+            self.loop.call_soon_threadsafe(self.fan_out, message)
+
+    def build_message(self, event_type, data):
+        event_id = next(self._ids)
+        payload = json.dumps(data, cls=DjangoJSONEncoder)
+        return {
+            'id': event_id,
+            'type': event_type,
+            'data': data,
+            'frame': f"id: {event_id}\nevent: {event_type}\ndata: {payload}\n\n",
+        }
+
+    def fan_out(self, message):
+        self.replay.append(message)
+        for subscription in list(self.subscribers):
+            subscription.deliver(message)
+
+    def subscribe(self, last_event_id=None):
+        """Must be called from the event loop that serves the streams"""
+        self.loop = asyncio.get_running_loop()
+        backlog = []
+        if last_event_id is not None:
+            backlog = [message for message in self.replay if message['id'] > last_event_id]
+        subscription = Subscription(self, backlog, self.queue_size)
+        self.subscribers.add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        self.subscribers.discard(subscription)
+
+class PostgresBroker(InProcessBroker):
+    """Relays events between worker processes over PostgreSQL LISTEN/NOTIFY"""
+
+    channel = 'emergency_events'
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.listener = None
+
+    def publish(self, event_type, emergency):
+        payload = json.dumps({'type': event_type, 'id': emergency.id})
+        with connection.cursor() as cursor:
+            cursor.execute('SELECT pg_notify(%s, %s)', [self.channel, payload])
+
+    def subscribe(self, last_event_id=None):
+        subscription = super().subscribe(last_event_id)
+        if self.listener is None or self.listener.done():
+            self.listener = self.loop.create_task(self.listen())
+        return subscription
+
+    async def listen(self):
+        import psycopg
+
+        db = settings.DATABASES['default']
+        conn = await psycopg.AsyncConnection.connect(
+            dbname=db['NAME'], user=db['USER'], password=db['PASSWORD'],
+            host=db['HOST'], port=db['PORT'], autocommit=True
+        )
+        async with conn:
+            await conn.execute(f'LISTEN {self.channel}')
+            async for notify in conn.notifies():
+                event = json.loads(notify.payload)
+                data = await sync_to_async(self.load)(event['id'])
+                if data is not None:
+                    self.fan_out(self.build_message(event['type'], data))
+
+    def load(self, emergency_id):
+        emergency = Emergency.objects.select_related('reporter', 'assigned_to').filter(id=emergency_id).first()
+        return EmergencySerializer(emergency).data if emergency else None
+
+_broker = None
+
+def get_broker():
+    global _broker
+    if _broker is None:
+        broker_class = getattr(settings, 'EMERGENCY_EVENT_BROKER', 'myapp.events.InProcessBroker')
+        _broker = import_string(broker_class)()
+    return _broker
+
+def publish_emergency_event(event_type, emergency):
+    transaction.on_commit(lambda: get_broker().publish(event_type, emergency))
+
+# dispatch.py
+from django.conf import settings
+from django.contrib.gis.db.models import PointField
+from django.db import connection, transaction
+from django.db.models import F, Value
+from .events import publish_emergency_event
+from .filters import KNNDistance
+from .models import Emergency, Responder
+
+# New emergencies at these severities are assigned without waiting for a dispatcher
+AUTO_DISPATCH_SEVERITIES = ('critical', 'high')
+
+# Nearest responders considered per emergency when dispatching in batch
+DISPATCH_CANDIDATES = 20
+
+# Cost of leaving an emergency unmatched in the batch assignment, in metres
+UNMATCHED_COST = 1e12
+
+def auto_dispatch_enabled():
+    return getattr(settings, 'EMERGENCY_AUTO_DISPATCH', True)
+
+def available_responders():
+    return Responder.objects.filter(
+        available=True, location__isnull=False, active_assignments__lt=F('max_assignments')
+    )
+
+def assign_responder(emergency, responder):
+    emergency.assigned_to_id = responder.user_id
+    emergency.status = 'assigned'
+    emergency.save()  # track_responder_load moves the responder's load
+    publish_emergency_event('assigned', emergency)
+
+def dispatch_emergency(emergency_id):
+    """Assign a reported, unassigned emergency to the nearest available responder, or return None"""
+    with transaction.atomic():
+        emergency = Emergency.objects.select_for_update().filter(
+            id=emergency_id, status='reported', assigned_to__isnull=True, duplicate_of__isnull=True
+        ).first()
+        if emergency is None or emergency.location is None:
+            return None
+
+        point = Value(emergency.location, output_field=PointField(geography=True))
+        responder = available_responders().select_for_update(skip_locked=True).annotate(
+            knn=KNNDistance('location', point)
+        ).order_by('knn').first()
+        if responder is not None:
+            assign_responder(emergency, responder)
+        return responder
+
+def candidate_edges(emergency_ids, candidates):
+    """(emergency id, responder id, metres) for the nearest available responders of each emergency"""
+    emergency_table = Emergency._meta.db_table
+    responder_table = Responder._meta.db_table
+    # One KNN index walk per emergency, all in a single statement
+    with connection.cursor() as cursor:
+        cursor.execute(f"""
+            SELECT e.id, r.id, ST_Distance(e.location, r.location)
+            FROM {emergency_table} AS e
+            CROSS JOIN LATERAL (
+                SELECT id, location FROM {responder_table}
+                WHERE available AND location IS NOT NULL AND active_assignments < max_assignments
+                ORDER BY location <-> e.location
+                LIMIT %s
+            ) AS r
+            WHERE e.id = ANY(%s)
+        """, [candidates, emergency_ids])
+        return cursor.fetchall()
+
+def greedy_assignment(edges, slots):
+    matched = set()
+    for emergency_id, responder_id, distance in sorted(edges, key=lambda edge: edge[2]):
+        if emergency_id not in matched and slots.get(responder_id, 0) > 0:
+            matched.add(emergency_id)
+            slots[responder_id] -= 1
+            yield emergency_id, responder_id, distance
+
+def min_cost_assignment(edges, slots):
+    """Match emergencies to responder slots so the total distance is minimal"""
+    try:
+        import numpy
+        from scipy.optimize import linear_sum_assignment
+    except ImportError:
+        return list(greedy_assignment(edges, dict(slots)))
+
+    emergencies = sorted({emergency_id for emergency_id, _, _ in edges})
+    rows = {emergency_id: index for index, emergency_id in enumerate(emergencies)}
+    # One column per free slot, but never more slots than emergencies that could use them
+    demand = {}
+    for _, responder_id, _ in edges:
+        demand[responder_id] = demand.get(responder_id, 0) + 1
+    columns = {}
+    width = 0
+    for responder_id, count in demand.items():
+        free = min(count, slots.get(responder_id, 0))
+        columns[responder_id] = list(range(width, width + free))
+        width += free
+    if not width:
+        return []
+
+    costs = numpy.full((len(emergencies), width), UNMATCHED_COST)
+    for emergency_id, responder_id, distance in edges:
+        costs[rows[emergency_id], columns[responder_id]] = distance
+    owners = [responder_id for responder_id, taken in columns.items() for _ in taken]
+
+    return [
+        (emergencies[row], owners[column], costs[row, column])
+        for row, column in zip(*linear_sum_assignment(costs))
+        if costs[row, column] < UNMATCHED_COST
+    ]
+
+def dispatch_open_emergencies(limit=500, candidates=DISPATCH_CANDIDATES):
+    """Assign open critical and high emergencies with the least total travel distance"""
+    assigned = []
+    with transaction.atomic():
+        for severity in AUTO_DISPATCH_SEVERITIES:
+            emergencies = {
+                emergency.id: emergency
+                for emergency in Emergency.objects.select_for_update(skip_locked=True).filter(
+                    severity=severity, status='reported', assigned_to__isnull=True, location__isnull=False,
+                    duplicate_of__isnull=True
+                ).order_by('created_at')[:limit]
+            }
+            if not emergencies:
+                continue
+
+            edges = candidate_edges(list(emergencies), candidates)
+            responders = {
+                responder.id: responder
+                for responder in available_responders().select_for_update(skip_locked=True).filter(
+                    id__in={responder_id for _, responder_id, _ in edges}
+                )
+            }
+            slots = {
+                responder_id: responder.max_assignments - responder.active_assignments
+                for responder_id, responder in responders.items()
+            }
+            edges = [edge for edge in edges if edge[1] in responders]
+
+            for emergency_id, responder_id, distance in min_cost_assignment(edges, slots):
+                assign_responder(emergencies[emergency_id], responders[responder_id])
+                assigned.append((emergencies[emergency_id], responders[responder_id], distance))
+    return assigned
+
+# alerts.py
+import logging
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+from django.utils import timezone
+from django.utils.module_loading import import_string
+from .models import SEVERITY_RANK, Emergency, WatchAlert, WatchArea
+
+logger = logging.getLogger(__name__)
+
+WATCH_ALERT_BATCH_SIZE = 500
+
+def enqueue_watch_alerts(emergency, event, previous_rank=-1):
+    """Queue an alert for every active watch area containing the emergency"""
+    rank = SEVERITY_RANK[emergency.severity]
+    with connection.cursor() as cursor:
+        cursor.execute(f"""
+            INSERT INTO {WatchAlert._meta.db_table} (watch_area_id, emergency_id, event, created_at)
+            SELECT id, %s, %s, now() FROM {WatchArea._meta.db_table}
+            WHERE active AND ST_Intersects(area, ST_SetSRID(ST_MakePoint(%s, %s), 4326))
+              AND min_severity_rank <= %s AND min_severity_rank > %s
+            ON CONFLICT (watch_area_id, emergency_id) DO NOTHING
+        """, [emergency.id, event, emergency.lng, emergency.lat, rank, previous_rank])
+        return cursor.rowcount
+
+@receiver(post_save, sender=Emergency)
+def match_watch_areas(sender, instance, created, **kwargs):
+    previous = None if created else getattr(instance, '_alerted_severity', None)
+    instance._alerted_severity = instance.severity
+    # Merged reports are covered by their parent incident, which
+    # merge_into_parent saves (and escalates if needed)
+    if instance.duplicate_of_id or instance.status in ('resolved', 'closed'):
+        return
+    if created:
+        enqueue_watch_alerts(instance, 'created')
+    elif previous is not None and SEVERITY_RANK[instance.severity] > SEVERITY_RANK[previous]:
+        enqueue_watch_alerts(instance, 'escalated', SEVERITY_RANK[previous])
+
+def log_watch_alerts(alerts):
+    """Default WATCH_ALERT_SENDER: log each alert; replace with push, SMS or email delivery"""
+    for alert in alerts:
+        logger.info(
+            'Watch alert for %s: %s emergency %s in "%s"',
+            alert.watch_area.user.username, alert.emergency.severity, alert.emergency.id, alert.watch_area.name
+        )
+
+def deliver_watch_alerts(batch_size=WATCH_ALERT_BATCH_SIZE):
+    """Send one batch of queued alerts; returns how many were sent"""
+    sender = import_string(getattr(settings, 'WATCH_ALERT_SENDER', 'myapp.alerts.log_watch_alerts'))
+    with transaction.atomic():
+        alerts = list(
+            WatchAlert.objects.select_for_update(skip_locked=True, of=('self',))
+            .select_related('watch_area__user', 'emergency')
+            .filter(delivered_at__isnull=True)
+            .order_by('created_at')[:batch_size]
+        )
+        if alerts:
+            sender(alerts)
+            WatchAlert.objects.filter(id__in=[alert.id for alert in alerts]).update(delivered_at=timezone.now())
+    return len(alerts)
+
+# archive.py
+from django.db import connection, transaction
+from django.utils import timezone
+from .models import ArchivedEmergency, Emergency, WatchAlert
+
+# Resolved and closed emergencies untouched for this long leave the live table
+ARCHIVE_AFTER = timezone.timedelta(days=90)
+
+def archive_emergency_batch(cutoff, batch_size):
+    """Move up to batch_size finished emergencies last changed before cutoff; returns (ids, changed points)"""
+    emergency_table = Emergency._meta.db_table
+    columns = ', '.join(field.column for field in Emergency._meta.concrete_fields)
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute(f"""
+            SELECT id, lng, lat FROM {emergency_table}
+            WHERE status IN ('resolved', 'closed') AND greatest(resolved_at, updated_at) < %s
+            ORDER BY id LIMIT %s
+            FOR UPDATE SKIP LOCKED
+        """, [cutoff, batch_size])
+        rows = cursor.fetchall()
+        ids = [row[0] for row in rows]
+        if not ids:
+            return [], []
+
+        # update_status gives merged reports their parent's status; these must
+        # leave with the parent, since the live table may not point at it
+        cursor.execute(f"""
+            SELECT id, lng, lat FROM {emergency_table}
+            WHERE duplicate_of_id = ANY(%s) AND NOT id = ANY(%s) AND status IN ('resolved', 'closed')
+            FOR UPDATE
+        """, [ids, ids])
+        rows += cursor.fetchall()
+        ids = [row[0] for row in rows]
+
+        cursor.execute(f"""
+            INSERT INTO {ArchivedEmergency._meta.db_table} ({columns}, archived_at)
+            SELECT {columns}, now() FROM {emergency_table} WHERE id = ANY(%s)
+        """, [ids])
+        # Still-open reports merged into an archived incident stand alone
+        # again (and show on the map); rebuild_rollups then counts them
+        cursor.execute(f"""
+            UPDATE {emergency_table} SET duplicate_of_id = NULL
+            WHERE duplicate_of_id = ANY(%s) AND NOT id = ANY(%s) AND status NOT IN ('resolved', 'closed')
+            RETURNING id, lng, lat
+        """, [ids, ids])
+        unlinked = cursor.fetchall()
+        cursor.execute(f'DELETE FROM {WatchAlert._meta.db_table} WHERE emergency_id = ANY(%s)', [ids])
+        # Raw SQL skips the delete signals, so EmergencyCounter keeps counting the archive
+        cursor.execute(f'DELETE FROM {emergency_table} WHERE id = ANY(%s)', [ids])
+    return ids, [(lng, lat) for _, lng, lat in rows + unlinked]
 
 # views.py
 from rest_framework import viewsets, status, permissions
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from django.utils import timezone
-from django.db.models import Q
-from .models import Emergency
-from .serializers import EmergencySerializer, EmergencyCreateSerializer
+from django.contrib.gis.db.models import PointField
+from django.contrib.gis.db.models.functions import Distance
+from django.contrib.gis.geos import Point
+from django.db import transaction
+from django.db.models import Count, Q, Value
+from django.http import JsonResponse, StreamingHttpResponse
+from rest_framework.authtoken.models import Token
+from .models import ArchivedEmergency, Emergency, EmergencyCounter, Responder, WatchAlert, WatchArea
+from rest_framework.renderers import BrowsableAPIRenderer
+from .serializers import (
+    ArchivedEmergencySerializer, EmergencySerializer, EmergencyCreateSerializer, ResponderSerializer, WatchAreaSerializer,
+    emergency_rows, emergency_values
+)
+from .renderers import FastJSONRenderer
+from .filters import EmergencyFilter, KNNDistance
+from .events import SubscriptionClosed, get_broker, publish_emergency_event
+from .dispatch import AUTO_DISPATCH_SEVERITIES, auto_dispatch_enabled, dispatch_emergency, dispatch_open_emergencies
+from .caching import conditional_response
+from .trends import EMERGENCY_TREND_GROUPS, trend_series
+
+# Idle streams send an SSE comment this often so proxies keep them open
+STREAM_HEARTBEAT_SECONDS = 15
+
+NEAREST_DEFAULT_K = 10
+NEAREST_MAX_K = 100
 
 class EmergencyViewSet(viewsets.ModelViewSet):
     """
@@ -100,6 +1006,9 @@ class EmergencyViewSet(viewsets.ModelViewSet):
     """
     queryset = Emergency.objects.all()
     permission_classes = [permissions.IsAuthenticated]
+    query_budgets = {'list': 4, 'active': 3, 'critical': 3, 'nearest': 3, 'statistics': 4, 'trends': 4}
+    replica_actions = {'list', 'retrieve', 'active', 'critical', 'nearest', 'statistics', 'trends'}
+    renderer_classes = [FastJSONRenderer, BrowsableAPIRenderer]
     
     def get_serializer_class(self):
         if self.action == 'create':
@@ -107,77 +1016,100 @@ class EmergencyViewSet(viewsets.ModelViewSet):
         return EmergencySerializer
 
     def get_queryset(self):
-        queryset = Emergency.objects.all()
-        
-        # Filter by severity
-        severity = self.request.query_params.get('severity', None)
-        if severity:
-            queryset = queryset.filter(severity=severity)
-        
-        # Filter by status
-        status_filter = self.request.query_params.get('status', None)
-        if status_filter:
-            queryset = queryset.filter(status=status_filter)
-        
-        # Filter by location (radius search)
-        lat = self.request.query_params.get('lat', None)
-        lng = self.request.query_params.get('lng', None)
-        radius = self.request.query_params.get('radius', None)
-        
-        if lat and lng and radius:
-            # Simple bounding box filter (for more accurate distance, use PostGIS)
-            lat, lng, radius = float(lat), float(lng), float(radius)
-            lat_delta = radius / 111  # Rough conversion km to degrees
-            lng_delta = radius / (111 * abs(lat))
-            
-            queryset = queryset.filter(
-                lat__gte=lat - lat_delta,
-                lat__lte=lat + lat_delta,
-                lng__gte=lng - lng_delta,
-                lng__lte=lng + lng_delta
-            )
-        
-        # Filter by time range
-        time_filter = self.request.query_params.get('time_range', None)
-        if time_filter:
-            now = timezone.now()
-            if time_filter == '1h':
-                queryset = queryset.filter(created_at__gte=now - timezone.timedelta(hours=1))
-            elif time_filter == '24h':
-                queryset = queryset.filter(created_at__gte=now - timezone.timedelta(days=1))
-            elif time_filter == '7d':
-                queryset = queryset.filter(created_at__gte=now - timezone.timedelta(days=7))
-        
-        return queryset
+        # EmergencySerializer reads reporter and assigned_to names for every row
+        queryset = Emergency.objects.select_related('reporter', 'assigned_to')
+        emergency_filter = EmergencyFilter.from_params(self.request.query_params)
+        # Lists show incidents only, but merged reports stay reachable by id
+        emergency_filter.include_duplicates = emergency_filter.include_duplicates or self.detail
+        return emergency_filter.apply(queryset)
+
+    @conditional_response('emergencies', per_minute=True)
+    def list(self, request, *args, **kwargs):
+        # Same payload as the serializer path, without per-row field dispatch
+        now = timezone.now()
+        values = emergency_values(self.get_queryset())
+        page = self.paginate_queryset(values)
+        if page is not None:
+            return self.get_paginated_response(emergency_rows(page, now))
+        return Response(emergency_rows(values, now))
+
+    def perform_create(self, serializer):
+        emergency = serializer.save()
+        publish_emergency_event('created', emergency)
+        if emergency.duplicate_of_id:
+            # merge_into_parent raised the incident's report count and maybe its severity
+            publish_emergency_event('updated', emergency.duplicate_of)
+        if emergency.severity in AUTO_DISPATCH_SEVERITIES and not emergency.duplicate_of_id and auto_dispatch_enabled():
+            transaction.on_commit(lambda: dispatch_emergency(emergency.id))
 
     @action(detail=False, methods=['get'])
+    @conditional_response('emergencies', per_minute=True)
     def active(self, request):
         """Get only active emergencies (not resolved or closed)"""
         active_emergencies = self.get_queryset().exclude(
             status__in=['resolved', 'closed']
         )
-        serializer = self.get_serializer(active_emergencies, many=True)
-        return Response(serializer.data)
+        return Response(emergency_rows(emergency_values(active_emergencies)))
 
     @action(detail=False, methods=['get'])
+    @conditional_response('emergencies', per_minute=True)
+    def nearest(self, request):
+        """Get the k active emergencies closest to lat/lng, nearest first"""
+        try:
+            point = Point(float(request.query_params['lng']), float(request.query_params['lat']), srid=4326)
+            k = min(int(request.query_params.get('k', NEAREST_DEFAULT_K)), NEAREST_MAX_K)
+        except (KeyError, ValueError):
+            return Response(
+                {'error': 'lat and lng are required, k must be an integer'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        nearest_emergencies = self.get_queryset().exclude(
+            status__in=['resolved', 'closed']
+        ).annotate(
+            knn=KNNDistance('location', Value(point, output_field=PointField(geography=True))),
+            distance=Distance('location', point),
+        ).order_by('knn')[:k]
+
+        serializer = self.get_serializer(nearest_emergencies, many=True)
+        return Response([
+            {**data, 'distance_km': round(emergency.distance.km, 3)}
+            for data, emergency in zip(serializer.data, nearest_emergencies)
+        ])
+
+    @action(detail=False, methods=['get'])
+    @conditional_response('emergencies', per_minute=True)
     def critical(self, request):
         """Get only critical emergencies"""
         critical_emergencies = self.get_queryset().filter(severity='critical')
-        serializer = self.get_serializer(critical_emergencies, many=True)
-        return Response(serializer.data)
+        return Response(emergency_rows(emergency_values(critical_emergencies)))
 
     @action(detail=True, methods=['post'])
     def assign(self, request, pk=None):
-        """Assign emergency to a user"""
+        """Assign emergency to a user, or to the nearest available responder if no user_id is given"""
         emergency = self.get_object()
         user_id = request.data.get('user_id')
+
+        if not user_id:
+            if dispatch_emergency(emergency.id) is None:
+                return Response(
+                    {'error': 'Emergency is already assigned or no responder is available'},
+                    status=status.HTTP_409_CONFLICT
+                )
+            emergency.refresh_from_db()
+            serializer = self.get_serializer(emergency)
+            return Response(serializer.data)
         
         try:
             from django.contrib.auth.models import User
             assignee = User.objects.get(id=user_id)
-            emergency.assigned_to = assignee
-            emergency.status = 'assigned'
-            emergency.save()
+            with transaction.atomic():
+                # Locked so an automatic dispatch cannot assign it at the same time
+                emergency = Emergency.objects.select_for_update().get(id=emergency.id)
+                emergency.assigned_to = assignee
+                emergency.status = 'assigned'
+                emergency.save()
+                publish_emergency_event('assigned', emergency)
             
             serializer = self.get_serializer(emergency)
             return Response(serializer.data)
@@ -187,6 +1119,22 @@ class EmergencyViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_400_BAD_REQUEST
             )
 
+    # Not named dispatch: that would replace APIView.dispatch
+    @action(detail=False, methods=['post'], url_path='dispatch', permission_classes=[permissions.IsAdminUser])
+    def dispatch_open(self, request):
+        """Assign all open critical and high emergencies at once, minimizing total travel distance"""
+        assigned = dispatch_open_emergencies()
+        return Response({
+            'assigned': [
+                {
+                    'emergency': emergency.id,
+                    'assigned_to': responder.user_id,
+                    'distance_km': round(distance / 1000, 3),
+                }
+                for emergency, responder, distance in assigned
+            ]
+        })
+
     @action(detail=True, methods=['post'])
     def update_status(self, request, pk=None):
         """Update emergency status"""
@@ -199,49 +1147,226 @@ class EmergencyViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_400_BAD_REQUEST
             )
         
-        emergency.status = new_status
-        if new_status == 'resolved':
-            emergency.resolved_at = timezone.now()
-        emergency.save()
+        with transaction.atomic():
+            emergency.status = new_status
+            if new_status == 'resolved':
+                emergency.resolved_at = timezone.now()
+            emergency.save()
+            publish_emergency_event('status_updated', emergency)
+            # Merged reports follow their incident. They hold no counters, but
+            # may hold a responder's load, and they have tiles and streams
+            for duplicate in emergency.duplicates.all():
+                duplicate.status = new_status
+                duplicate.resolved_at = emergency.resolved_at
+                duplicate.save(update_fields=['status', 'resolved_at', 'updated_at'])
+                publish_emergency_event('status_updated', duplicate)
         
         serializer = self.get_serializer(emergency)
         return Response(serializer.data)
 
     @action(detail=False, methods=['get'])
+    @conditional_response('emergencies', per_minute=True)
+    def trends(self, request):
+        """Emergencies per hour, day or week by severity or status"""
+        time_field = {'created': 'created_at', 'resolved': 'resolved_at'}.get(request.query_params.get('field', 'created'))
+        if time_field is None:
+            return Response(
+                {'error': 'Invalid field, expected created or resolved'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        return Response(trend_series(
+            self.history_querysets(), time_field, request.query_params, EMERGENCY_TREND_GROUPS, 'severity'
+        ))
+
+    @action(detail=False, methods=['get'])
+    @conditional_response('emergencies', per_minute=True)
     def statistics(self, request):
         """Get emergency statistics"""
-        total = self.get_queryset().count()
-        critical = self.get_queryset().filter(severity='critical').count()
-        high = self.get_queryset().filter(severity='high').count()
-        active = self.get_queryset().exclude(status__in=['resolved', 'closed']).count()
-        resolved_today = self.get_queryset().filter(
-            status='resolved',
-            resolved_at__gte=timezone.now().replace(hour=0, minute=0, second=0)
-        ).count()
-        
-        return Response({
-            'total': total,
-            'critical': critical,
-            'high': high,
-            'active': active,
-            'resolved_today': resolved_today
-        })
+        midnight = timezone.now().replace(hour=0, minute=0, second=0, microsecond=0)
+        resolved_today_key = f'resolved_on:{midnight.date().isoformat()}'
+        filter_params = {'severity', 'status', 'lat', 'lng', 'radius', 'time_range', 'include_duplicates'}
+
+        if filter_params.isdisjoint(request.query_params):
+            # Unfiltered: read the rollup counters instead of the table
+            keys = [f'severity:{key}' for key, _ in Emergency.SEVERITY_CHOICES]
+            keys += ['status:resolved', 'status:closed', resolved_today_key]
+            counters = dict(EmergencyCounter.objects.filter(key__in=keys).values_list('key', 'count'))
+            total = sum(counters.get(f'severity:{key}', 0) for key, _ in Emergency.SEVERITY_CHOICES)
+
+            return Response({
+                'total': total,
+                'critical': counters.get('severity:critical', 0),
+                'high': counters.get('severity:high', 0),
+                'active': total - counters.get('status:resolved', 0) - counters.get('status:closed', 0),
+                'resolved_today': counters.get(resolved_today_key, 0)
+            })
+
+        # Like the counters, filtered counts include the archived history
+        stats = dict.fromkeys(['total', 'critical', 'high', 'active', 'resolved_today'], 0)
+        for emergencies in self.history_querysets():
+            counts = emergencies.aggregate(
+                total=Count('id'),
+                critical=Count('id', filter=Q(severity='critical')),
+                high=Count('id', filter=Q(severity='high')),
+                active=Count('id', filter=~Q(status__in=['resolved', 'closed'])),
+                resolved_today=Count('id', filter=Q(status='resolved', resolved_at__gte=midnight)),
+            )
+            for key, count in counts.items():
+                stats[key] += count
+        return Response(stats)
+
+    def history_querysets(self):
+        """Live and archived emergencies with the list filters, for counts over all time"""
+        emergency_filter = EmergencyFilter.from_params(self.request.query_params)
+        return [emergency_filter.apply(Emergency.objects.all()), emergency_filter.apply(ArchivedEmergency.objects.all())]
+
+class ArchivedEmergencyViewSet(viewsets.ReadOnlyModelViewSet):
+    """Archived (resolved or closed, see archive_emergencies) emergencies, with the list filters"""
+    serializer_class = ArchivedEmergencySerializer
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get_queryset(self):
+        queryset = ArchivedEmergency.objects.select_related('reporter', 'assigned_to')
+        return EmergencyFilter.from_params(self.request.query_params).apply(queryset)
+
+class ResponderViewSet(viewsets.ReadOnlyModelViewSet):
+    """Responders with their position and load, for the dispatch map"""
+    queryset = Responder.objects.select_related('user').order_by('id')
+    serializer_class = ResponderSerializer
+    permission_classes = [permissions.IsAuthenticated]
+
+    @action(detail=False, methods=['post'])
+    def location(self, request):
+        """Report the current user's position (lat, lng) and, optionally, availability"""
+        try:
+            lat = float(request.data['lat'])
+            lng = float(request.data['lng'])
+        except (KeyError, TypeError, ValueError):
+            return Response(
+                {'error': 'lat and lng are required'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        # Staff register responders in the admin; nobody makes themselves one
+        responder = Responder.objects.filter(user=request.user).first()
+        if responder is None:
+            return Response(
+                {'error': 'You are not registered as a responder'},
+                status=status.HTTP_403_FORBIDDEN
+            )
+        responder.location = Point(lng, lat, srid=4326)
+        responder.location_updated_at = timezone.now()
+        if 'available' in request.data:
+            responder.available = str(request.data['available']).lower() in ('true', '1')
+        responder.save(update_fields=['location', 'location_updated_at', 'available'])
+
+        serializer = self.get_serializer(responder)
+        return Response(serializer.data)
+
+class WatchAreaViewSet(viewsets.ModelViewSet):
+    """The current user's watch areas, and the alerts queued for them"""
+    serializer_class = WatchAreaSerializer
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get_queryset(self):
+        return WatchArea.objects.filter(user=self.request.user).order_by('id')
+
+    def perform_create(self, serializer):
+        serializer.save(user=self.request.user)
+
+    @action(detail=False, methods=['get'])
+    def alerts(self, request):
+        """The 100 most recent alerts across the user's watch areas"""
+        alerts = WatchAlert.objects.filter(watch_area__user=request.user).select_related(
+            'watch_area', 'emergency__reporter', 'emergency__assigned_to'
+        ).order_by('-created_at')[:100]
+        return Response([
+            {
+                'id': alert.id,
+                'watch_area': alert.watch_area_id,
+                'watch_area_name': alert.watch_area.name,
+                'event': alert.event,
+                'created_at': alert.created_at,
+                'delivered_at': alert.delivered_at,
+                'emergency': EmergencySerializer(alert.emergency).data,
+            }
+            for alert in alerts
+        ])
+
+async def authenticate_stream(request):
+    """Token or session auth for the stream, which runs outside DRF"""
+    auth = request.headers.get('Authorization', '')
+    if auth.startswith('Token '):
+        try:
+            token = await Token.objects.select_related('user').aget(key=auth[len('Token '):])
+        except Token.DoesNotExist:
+            return None
+        return token.user if token.user.is_active else None
+
+    user = await request.auser()
+    return user if user.is_authenticated else None
+
+async def emergency_stream(request):
+    """Server-Sent Events stream of emergency changes, honoring the list filters (ASGI only)"""
+    if await authenticate_stream(request) is None:
+        return JsonResponse(
+            {'detail': 'Authentication credentials were not provided.'},
+            status=status.HTTP_401_UNAUTHORIZED
+        )
+
+    try:
+        emergency_filter = EmergencyFilter.from_params(request.GET)
+        last_event_id = request.headers.get('Last-Event-ID') or request.GET.get('last_event_id')
+        last_event_id = int(last_event_id) if last_event_id else None
+    except ValueError:
+        return JsonResponse(
+            {'error': 'Invalid stream parameters'},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+
+    subscription = get_broker().subscribe(last_event_id)
+
+    async def events():
+        try:
+            yield 'retry: 5000\n\n'
+            while True:
+                message = await subscription.get(STREAM_HEARTBEAT_SECONDS)
+                if message is None:
+                    yield ': heartbeat\n\n'
+                elif emergency_filter.matches(message['data']):
+                    yield message['frame']
+        except SubscriptionClosed:
+            pass
+        finally:
+            subscription.close()
+
+    response = StreamingHttpResponse(events(), content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'  # Disable nginx response buffering
+    return response
 
 # urls.py
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
-from .views import EmergencyViewSet
+from .views import ArchivedEmergencyViewSet, EmergencyViewSet, ResponderViewSet, WatchAreaViewSet, emergency_stream
 
 router = DefaultRouter()
+# Before emergencies, whose detail route would otherwise take "archive" as an id
+router.register(r'emergencies/archive', ArchivedEmergencyViewSet, basename='archived-emergency')
 router.register(r'emergencies', EmergencyViewSet)
+router.register(r'responders', ResponderViewSet)
+router.register(r'watch-areas', WatchAreaViewSet, basename='watch-area')
 
 urlpatterns = [
+    # Before the router, which would otherwise treat "stream" as an emergency id
+    path('api/emergencies/stream/', emergency_stream, name='emergency-stream'),
     path('api/', include(router.urls)),
 ]
 
 # admin.py
 from django.contrib import admin
-from .models import Emergency
+from .models import ArchivedEmergency, Emergency, Responder
 
 @admin.register(Emergency)
 class EmergencyAdmin(admin.ModelAdmin):
@@ -266,6 +1391,29 @@ class EmergencyAdmin(admin.ModelAdmin):
         }),
     )
 
+@admin.register(ArchivedEmergency)
+class ArchivedEmergencyAdmin(admin.ModelAdmin):
+    list_display = ['title', 'severity', 'status', 'reporter', 'created_at', 'archived_at']
+    list_filter = ['severity', 'status']
+    search_fields = ['title', 'description', 'reporter__username']
+    date_hierarchy = 'created_at'
+    # History is read-only; archive_emergencies is the only writer
+    readonly_fields = [field.name for field in ArchivedEmergency._meta.fields]
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_delete_permission(self, request, obj=None):
+        return False
+
+@admin.register(Responder)
+class ResponderAdmin(admin.ModelAdmin):
+    list_display = ['user', 'available', 'active_assignments', 'max_assignments', 'location_updated_at']
+    list_filter = ['available']
+    search_fields = ['user__username']
+    # Position comes from the responder's app; the load from the Emergency signals
+    readonly_fields = ['location', 'location_updated_at', 'active_assignments']
+
 # Sample data creation script (management command)
 # Create this as: management/commands/create_sample_emergencies.py
 from django.core.management.base import BaseCommand
@@ -328,15 +1476,217 @@ class Command(BaseCommand):
             self.style.SUCCESS('Successfully created sample emergencies')
         )
 
+# Location backfill (management command)
+# Create this as: management/commands/backfill_emergency_locations.py
+from django.core.management.base import BaseCommand
+from django.db import connection
+from myapp.models import Emergency
+
+class Command(BaseCommand):
+    help = 'Fill Emergency.location from lat/lng for rows saved before the column existed'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=10000)
+
+    def handle(self, *args, **options):
+        table = Emergency._meta.db_table
+        total = 0
+
+        # Small batches keep each UPDATE's row locks short on a live table
+        with connection.cursor() as cursor:
+            while True:
+                cursor.execute(f"""
+                    UPDATE {table} SET location = ST_SetSRID(ST_MakePoint(lng, lat), 4326)::geography
+                    WHERE id IN (SELECT id FROM {table} WHERE location IS NULL LIMIT %s)
+                """, [options['batch_size']])
+                if cursor.rowcount == 0:
+                    break
+                total += cursor.rowcount
+
+        self.stdout.write(
+            self.style.SUCCESS(f'Backfilled location for {total} emergencies')
+        )
+
+# Radius search benchmark (management command)
+# Create this as: management/commands/benchmark_emergency_radius.py
+import random
+import statistics
+import time
+from django.contrib.auth.models import User
+from django.contrib.gis.db.models import PointField
+from django.contrib.gis.geos import Point
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.db.models import Value
+from myapp.filters import EmergencyFilter
+from myapp.models import Emergency
+from myapp.filters import KNNDistance
+
+class Command(BaseCommand):
+    help = 'Compare the legacy lat/lng bounding box, ST_DWithin and KNN on synthetic rows (rolled back)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=1000000)
+        parser.add_argument('--queries', type=int, default=50)
+        parser.add_argument('--radius', type=float, default=5, help='Search radius in km')
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            self.seed(options['rows'])
+            # Points inside the seeded extent (roughly India)
+            centers = [(random.uniform(10, 30), random.uniform(70, 88)) for _ in range(options['queries'])]
+            radius = options['radius']
+
+            def legacy_bbox(lat, lng):
+                lat_delta = radius / 111
+                lng_delta = radius / (111 * abs(lat))
+                return Emergency.objects.filter(
+                    lat__gte=lat - lat_delta, lat__lte=lat + lat_delta,
+                    lng__gte=lng - lng_delta, lng__lte=lng + lng_delta
+                )
+
+            def dwithin(lat, lng):
+                return EmergencyFilter(center=(lat, lng), radius_km=radius).apply(Emergency.objects.all())
+
+            def knn(lat, lng):
+                point = Value(Point(lng, lat, srid=4326), output_field=PointField(geography=True))
+                return Emergency.objects.exclude(status__in=['resolved', 'closed']).annotate(
+                    knn=KNNDistance('location', point)
+                ).order_by('knn')[:10]
+
+            for name, query in (('legacy bbox', legacy_bbox), ('ST_DWithin', dwithin), ('KNN k=10', knn)):
+                timings = []
+                for lat, lng in centers:
+                    started = time.perf_counter()
+                    list(query(lat, lng).values_list('id', flat=True))
+                    timings.append((time.perf_counter() - started) * 1000)
+                timings.sort()
+                self.stdout.write(
+                    f'{name:12} p50 {statistics.median(timings):8.2f} ms   '
+                    f'p99 {timings[min(len(timings) - 1, int(len(timings) * 0.99))]:8.2f} ms'
+                )
+
+            # Leave the database as it was
+            transaction.set_rollback(True)
+
+    def seed(self, rows):
+        reporter = User.objects.create(username=f'benchmark-{time.time_ns()}')
+        table = Emergency._meta.db_table
+        with connection.cursor() as cursor:
+            cursor.execute(f"""
+                INSERT INTO {table} (title, description, lat, lng, location, severity, status,
+                                     reporter_id, created_at, updated_at, report_count)
+                SELECT 'Benchmark', '', lat, lng, ST_SetSRID(ST_MakePoint(lng, lat), 4326)::geography,
+                       (ARRAY['low', 'medium', 'high', 'critical'])[1 + i % 4],
+                       (ARRAY['reported', 'assigned', 'in_progress', 'resolved', 'closed'])[1 + i % 5],
+                       %s, now() - (i % 10000) * interval '1 minute', now(), 1
+                FROM (
+                    SELECT i, 10 + random() * 20 AS lat, 70 + random() * 18 AS lng
+                    FROM generate_series(1, %s) AS i
+                ) AS points
+            """, [reporter.id, rows])
+            cursor.execute(f'ANALYZE {table}')
+        self.stdout.write(f'Seeded {rows} emergencies')
+
+# Batch dispatch (management command; run from cron or with --loop during surges)
+# Create this as: management/commands/dispatch_emergencies.py
+import time
+from django.core.management.base import BaseCommand
+from myapp.dispatch import DISPATCH_CANDIDATES, dispatch_open_emergencies
+
+class Command(BaseCommand):
+    help = 'Assign open critical and high emergencies to responders, minimizing total travel distance'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--limit', type=int, default=500, help='Emergencies per severity per round')
+        parser.add_argument('--candidates', type=int, default=DISPATCH_CANDIDATES, help='Nearest responders considered each')
+        parser.add_argument('--loop', action='store_true', help='Keep dispatching')
+        parser.add_argument('--interval', type=float, default=5, help='Seconds between rounds with --loop')
+
+    def handle(self, *args, **options):
+        while True:
+            started = time.perf_counter()
+            assigned = dispatch_open_emergencies(options['limit'], options['candidates'])
+            if assigned or not options['loop']:
+                self.stdout.write(
+                    f'Assigned {len(assigned)} emergencies in {(time.perf_counter() - started) * 1000:.1f} ms'
+                )
+            if not options['loop']:
+                break
+            time.sleep(options['interval'])
+
+# Watch-area alert delivery (management command; run from cron or with --loop as a worker)
+# Create this as: management/commands/deliver_watch_alerts.py
+import time
+from django.core.management.base import BaseCommand
+from myapp.alerts import WATCH_ALERT_BATCH_SIZE, deliver_watch_alerts
+
+class Command(BaseCommand):
+    help = 'Send queued watch-area alerts in batches through WATCH_ALERT_SENDER'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=WATCH_ALERT_BATCH_SIZE)
+        parser.add_argument('--loop', action='store_true', help='Keep polling for new alerts')
+        parser.add_argument('--interval', type=float, default=2, help='Seconds between polls with --loop')
+
+    def handle(self, *args, **options):
+        while True:
+            total = 0
+            while True:
+                sent = deliver_watch_alerts(options['batch_size'])
+                total += sent
+                if sent < options['batch_size']:
+                    break
+            if total or not options['loop']:
+                self.stdout.write(f'Delivered {total} watch alerts')
+            if not options['loop']:
+                break
+            time.sleep(options['interval'])
+
+# Emergency archival (management command; run nightly)
+# Create this as: management/commands/archive_emergencies.py
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from myapp.archive import ARCHIVE_AFTER, archive_emergency_batch
+from myapp.caching import bump_versions
+from myapp.tiles import invalidate_tiles
+
+class Command(BaseCommand):
+    help = 'Move resolved and closed emergencies older than --days into the archive table'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, default=ARCHIVE_AFTER.days)
+        parser.add_argument('--batch-size', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        cutoff = timezone.now() - timezone.timedelta(days=options['days'])
+        total = 0
+        # Short batches keep locks brief while the live table is in use
+        while True:
+            ids, points = archive_emergency_batch(cutoff, options['batch_size'])
+            if not ids:
+                break
+            total += len(ids)
+            invalidate_tiles('emergencies', points)
+            self.stdout.write(f'Archived {total} emergencies')
+
+        if total:
+            bump_versions(['emergencies'])
+        self.stdout.write(self.style.SUCCESS(f'Archived {total} emergencies resolved or closed before {cutoff.date()}'))
+
 # Add to settings.py
 INSTALLED_APPS = [
     # ... your other apps
+    'django.contrib.gis',
     'rest_framework',
+    'rest_framework.authtoken',
     'corsheaders',  # for CORS if frontend is on different domain
     # ... your emergency app name
 ]
 
 MIDDLEWARE = [
+    'myapp.instrumentation.QueryInstrumentationMiddleware',
+    'myapp.replicas.ReplicaRoutingMiddleware',
     # ... other middleware
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -359,3 +1709,33 @@ REST_FRAMEWORK = {
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
     'PAGE_SIZE': 20
 }
+
+# Assign new critical/high emergencies to the nearest available responder
+EMERGENCY_AUTO_DISPATCH = True
+
+# Called with each batch of queued watch-area alerts by deliver_watch_alerts
+WATCH_ALERT_SENDER = 'myapp.alerts.log_watch_alerts'
+
+# Event stream broker: InProcessBroker for a single worker (and tests),
+# PostgresBroker when several ASGI workers serve /api/emergencies/stream/
+EMERGENCY_EVENT_BROKER = 'myapp.events.InProcessBroker'
+ASGI_APPLICATION = 'your_project.asgi.application'  # serve with uvicorn or daphne
+
+# Conditional GETs: versions must be shared across workers, bodies stay local
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+        'LOCATION': 'redis://127.0.0.1:6379',
+    },
+    'responses': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'TIMEOUT': 300,
+        'OPTIONS': {'MAX_ENTRIES': 2000},
+    },
+}
+
+# Polling reads (each viewset's replica_actions) go to a random alias listed
+# here; writes and everything else use 'default'. Empty keeps all traffic on
+# the primary. DATABASES entries for these are shown in the mission backend.
+DATABASE_ROUTERS = ['myapp.replicas.ReplicaRouter']
+DATABASE_REPLICAS = []
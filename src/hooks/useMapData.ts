@@ -55,133 +55,83 @@ const boundsToBoxString = (bounds: any): string => {
   return `${sw.lng},${sw.lat},${ne.lng},${ne.lat}`;
 };
 
-// Fetch sightings with filters
-const fetchSightings = async (filters: MapFilters, bbox: string): Promise<Sighting[]> => {
-  try {
-    const params = new URLSearchParams();
-    
-    if (filters.timeRange.from) params.append('from', filters.timeRange.from);
-    if (filters.timeRange.to) params.append('to', filters.timeRange.to);
-    if (bbox) params.append('bbox', bbox);
-    if (filters.status.length > 0) params.append('status', filters.status.join(','));
-    if (filters.species) params.append('species', filters.species);
-    if (filters.driveId) params.append('drive_id', filters.driveId);
-    if (filters.searchQuery) params.append('q', filters.searchQuery);
-    params.append('limit', '1000');
-
-    const response = await api.get(`/api/sightings/?${params.toString()}`);
-    
-    // Convert FeatureCollection to Sighting array
-    if (response.data.type === 'FeatureCollection') {
-      return response.data.features.map((feature: any) => ({
-        id: feature.properties.id,
-        location: {
-          lat: feature.geometry.coordinates[1],
-          lng: feature.geometry.coordinates[0]
-        },
-        timestamp: feature.properties.timestamp,
-        status: feature.properties.status,
-        photo_url: feature.properties.photo_url,
-        notes: feature.properties.notes,
-        species: feature.properties.species,
-        reporter: feature.properties.reporter,
-        mission_id: feature.properties.mission_id
-      }));
+// Mock data for development when the API is not reachable
+const mockMapData: MapData = {
+  sightings: [
+    {
+      id: '1',
+      location: { lat: 28.6139, lng: 77.2090 },
+      timestamp: new Date().toISOString(),
+      status: 'active',
+      notes: 'Stray dog spotted near market',
+      species: 'dog',
+      reporter: 'Local volunteer'
+    },
+    {
+      id: '2',
+      location: { lat: 28.6149, lng: 77.2100 },
+      timestamp: new Date(Date.now() - 3600000).toISOString(),
+      status: 'sterilized',
+      notes: 'Cat successfully sterilized',
+      species: 'cat',
+      reporter: 'Vet team'
     }
-    
-    return response.data || [];
-  } catch (error) {
-    console.warn('Sightings API not available, using mock data');
-    // Return mock data for development
-    return [
-      {
-        id: '1',
-        location: { lat: 28.6139, lng: 77.2090 },
-        timestamp: new Date().toISOString(),
-        status: 'active',
-        notes: 'Stray dog spotted near market',
-        species: 'dog',
-        reporter: 'Local volunteer'
-      },
-      {
-        id: '2',
-        location: { lat: 28.6149, lng: 77.2100 },
-        timestamp: new Date(Date.now() - 3600000).toISOString(),
-        status: 'sterilized',
-        notes: 'Cat successfully sterilized',
-        species: 'cat',
-        reporter: 'Vet team'
-      }
-    ];
-  }
-};
-
-// Fetch drives
-const fetchDrives = async (): Promise<Drive[]> => {
-  try {
-    const response = await api.get('/api/drives/?active=true');
-    return response.data || [];
-  } catch (error) {
-    console.warn('Drives API not available, using mock data');
-    return [
-      {
-        id: '1',
-        title: 'South Delhi Drive',
-        center: { lat: 28.5245, lng: 77.2066 },
-        status: 'active'
-      },
-      {
-        id: '2',
-        title: 'Gurgaon Drive',
-        center: { lat: 28.4595, lng: 77.0266 },
-        status: 'active'
-      }
-    ];
-  }
-};
-
-// Fetch emergencies
-const fetchEmergencies = async (): Promise<Emergency[]> => {
-  try {
-    const response = await api.get('/api/emergencies/');
-    return response.data || [];
-  } catch (error) {
-    console.warn('Emergencies API not available, using mock data');
-    return [
-      {
-        id: '1',
-        title: 'Injured dog',
-        lat: 28.6139,
-        lng: 77.2090,
-        severity: 'high',
-        description: 'Dog with broken leg needs immediate attention',
-        created_at: new Date().toISOString()
-      }
-    ];
+  ],
+  drives: [
+    {
+      id: '1',
+      title: 'South Delhi Drive',
+      center: { lat: 28.5245, lng: 77.2066 },
+      status: 'active'
+    },
+    {
+      id: '2',
+      title: 'Gurgaon Drive',
+      center: { lat: 28.4595, lng: 77.0266 },
+      status: 'active'
+    }
+  ],
+  emergencies: [
+    {
+      id: '1',
+      title: 'Injured dog',
+      lat: 28.6139,
+      lng: 77.2090,
+      severity: 'high',
+      description: 'Dog with broken leg needs immediate attention',
+      created_at: new Date().toISOString()
+    }
+  ],
+  statistics: {
+    total_sightings: 156,
+    sterilized: 89,
+    active: 67,
+    hotspots: [
+      { lat: 28.6139, lng: 77.2090, intensity: 0.8 },
+      { lat: 28.6149, lng: 77.2100, intensity: 0.6 }
+    ]
   }
 };
 
-// Fetch statistics
-const fetchStatistics = async (filters: MapFilters, bbox: string) => {
+// Fetch sightings, drives, emergencies and statistics in one request
+const fetchSnapshot = async (filters: MapFilters, bbox: string): Promise<MapData> => {
   try {
     const params = new URLSearchParams();
+
     if (filters.timeRange.from) params.append('from', filters.timeRange.from);
     if (filters.timeRange.to) params.append('to', filters.timeRange.to);
     if (bbox) params.append('bbox', bbox);
+    if (filters.status.length > 0) params.append('status', filters.status.join(','));
+    if (filters.species) params.append('species', filters.species);
+    if (filters.driveId) params.append('drive_id', filters.driveId);
+    if (filters.searchQuery) params.append('q', filters.searchQuery);
+    if (filters.severityFilter.length > 0) params.append('severity', filters.severityFilter.join(','));
 
-    const response = await api.get(`/api/statistics/overview/?${params.toString()}`);
+    const response = await api.get(`/api/map/snapshot/?${params.toString()}`);
     return response.data;
   } catch (error) {
-    console.warn('Statistics API not available, using mock data');
-    return {
-      total_sightings: 156,
-      sterilized: 89,
-      active: 67,
-      hotspots: [
-        { lat: 28.6139, lng: 77.2090, intensity: 0.8 },
-        { lat: 28.6149, lng: 77.2100, intensity: 0.6 }
-      ]
-    };
+    console.warn('Map snapshot API not available, using mock data');
+    return mockMapData;
   }
 };
 
@@ -204,21 +154,7 @@ export function useMapData(filters: MapFilters, mapBounds: any) {
   // Fetch all data
   const query = useQuery({
     queryKey,
-    queryFn: async (): Promise<MapData> => {
-      const [sightings, drives, emergencies, statistics] = await Promise.all([
-        fetchSightings(filters, bbox),
-        fetchDrives(),
-        fetchEmergencies(),
-        fetchStatistics(filters, bbox)
-      ]);
-
-      return {
-        sightings,
-        drives,
-        emergencies,
-        statistics
-      };
-    },
+    queryFn: () => fetchSnapshot(filters, bbox),
     refetchInterval: 10000, // Refetch every 10 seconds for live updates
     staleTime: 5000, // Data considered fresh for 5 seconds
     enabled: !!mapBounds // Only fetch when map bounds are available